@@ -0,0 +1,214 @@
+"""External merge sort, for sorting streams of integers larger than memory."""
+
+import os
+from array import array
+from itertools import islice
+from tempfile import TemporaryDirectory
+from typing import BinaryIO
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import TextIO
+
+from my_python_kata.algorithms.merge_arrays import iter_merge
+
+
+# Number of values in every sorted run: runs are sorted in memory as Python
+# lists, which take roughly 36 bytes per value
+DEFAULT_RUN_SIZE = 1_000_000
+
+# Max number of runs merged at the same time
+DEFAULT_FAN_IN = 64
+
+# Number of values read or written at once from/to files
+DEFAULT_BUFFER_SIZE = 8192
+
+# Values are stored in temporary files as native signed 64 bit integers
+_TYPECODE = "q"
+
+
+def external_sort(
+    values: Iterable[int],
+    run_size: int = DEFAULT_RUN_SIZE,
+    fan_in: int = DEFAULT_FAN_IN,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    temp_dir: Optional[str] = None,
+) -> Iterator[int]:
+    """Sort a stream of integers, using temporary files.
+
+    The input is split into sorted runs of at most run_size values, which are
+    spilled to temporary files. Runs are then merged, at most fan_in at a
+    time, until they can be merged lazily into the output stream with
+    iter_merge(). Temporary files are deleted once the output is fully
+    consumed (or the returned iterator is closed).
+
+    Values must fit into signed 64 bit integers.
+
+    Args:
+        values: the integers to sort
+        run_size: the max number of values sorted in memory at once
+        fan_in: the max number of runs merged at the same time
+        buffer_size: the number of values read or written at once from/to
+            temporary files
+        temp_dir: the directory where temporary files are created
+            (default: the system temporary directory)
+
+    Returns:
+        an iterator over the sorted values
+
+    Raises:
+        ValueError: if run_size, fan_in or buffer_size are not valid
+    """
+    if run_size < 1 or fan_in < 2 or buffer_size < 1:
+        raise ValueError("run_size and buffer_size must be >= 1, fan_in >= 2")
+
+    return _external_sort(values, run_size, fan_in, buffer_size, temp_dir)
+
+
+def _external_sort(
+    values: Iterable[int],
+    run_size: int,
+    fan_in: int,
+    buffer_size: int,
+    temp_dir: Optional[str],
+) -> Iterator[int]:
+    iterator = iter(values)
+
+    first_run = sorted(islice(iterator, run_size))
+    if len(first_run) < run_size:
+        # Everything fits into memory, no need for temporary files
+        yield from first_run
+        return
+
+    with TemporaryDirectory(dir=temp_dir) as work_dir:
+        run_paths = [_write_run(work_dir, 0, 0, first_run, buffer_size)]
+
+        while True:
+            run = sorted(islice(iterator, run_size))
+            if not run:
+                break
+            run_paths.append(_write_run(work_dir, 0, len(run_paths), run, buffer_size))
+
+        merge_pass = 0
+        while len(run_paths) > fan_in:
+            merge_pass += 1
+            run_paths = [
+                _merge_runs(
+                    work_dir, merge_pass, i, run_paths[j : j + fan_in], buffer_size
+                )
+                for i, j in enumerate(range(0, len(run_paths), fan_in))
+            ]
+
+        yield from iter_merge(
+            *(_read_run(run_path, buffer_size) for run_path in run_paths)
+        )
+
+
+def _write_run(
+    work_dir: str,
+    merge_pass: int,
+    run_index: int,
+    values: Iterable[int],
+    buffer_size: int,
+) -> str:
+    run_path = os.path.join(work_dir, f"run-{merge_pass}-{run_index}.bin")
+
+    with open(run_path, "wb") as file:
+        write_binary_ints(values, file, buffer_size)
+
+    return run_path
+
+
+def _merge_runs(
+    work_dir: str,
+    merge_pass: int,
+    run_index: int,
+    run_paths: list[str],
+    buffer_size: int,
+) -> str:
+    merged_run_path = _write_run(
+        work_dir,
+        merge_pass,
+        run_index,
+        iter_merge(*(_read_run(run_path, buffer_size) for run_path in run_paths)),
+        buffer_size,
+    )
+
+    # Merged runs are not needed anymore, free disk space as soon as possible
+    for run_path in run_paths:
+        os.remove(run_path)
+
+    return merged_run_path
+
+
+def _read_run(run_path: str, buffer_size: int) -> Iterator[int]:
+    with open(run_path, "rb") as file:
+        yield from read_binary_ints(file, buffer_size)
+
+
+def read_binary_ints(
+    file: BinaryIO, buffer_size: int = DEFAULT_BUFFER_SIZE
+) -> Iterator[int]:
+    """Read native signed 64 bit integers from a binary file.
+
+    Args:
+        file: the binary file to read from
+        buffer_size: the number of values read at once
+
+    Yields:
+        the values read from the file
+    """
+    while True:
+        buffer = array(_TYPECODE)
+        try:
+            buffer.fromfile(file, buffer_size)
+        except EOFError:
+            # The values available before the end of file are still read
+            yield from buffer
+            return
+
+        yield from buffer
+
+
+def write_binary_ints(
+    values: Iterable[int], file: BinaryIO, buffer_size: int = DEFAULT_BUFFER_SIZE
+) -> None:
+    """Write integers as native signed 64 bit integers into a binary file.
+
+    Args:
+        values: the values to write
+        file: the binary file to write to
+        buffer_size: the number of values written at once
+    """
+    iterator = iter(values)
+    while True:
+        buffer = array(_TYPECODE, islice(iterator, buffer_size))
+        if not buffer:
+            return
+        buffer.tofile(file)
+
+
+def read_text_ints(file: TextIO) -> Iterator[int]:
+    """Read integers from a text file, one per line.
+
+    Blank lines are skipped.
+
+    Args:
+        file: the text file to read from
+
+    Yields:
+        the values read from the file
+    """
+    for line in file:
+        if not line.isspace():
+            yield int(line)
+
+
+def write_text_ints(values: Iterable[int], file: TextIO) -> None:
+    """Write integers into a text file, one per line.
+
+    Args:
+        values: the values to write
+        file: the text file to write to
+    """
+    file.writelines(f"{value}\n" for value in values)
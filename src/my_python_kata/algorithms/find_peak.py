@@ -1,39 +1,219 @@
 """Find peaks in unidimensional and bidimensional arrays."""
 
+import mmap
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import List
+from heapq import nlargest
+from itertools import chain
+from typing import Iterable
+from typing import Iterator
+from typing import Literal
 from typing import Optional
+from typing import Sequence
 from typing import cast
 
 
 # Findind a peak in 1-dimensional and 2-dimensional arrays.
-# For 1-dimensional arrays, complexity is O(lg2n)
-# For 2-dimensional arrays, complexity is O(rows*lg2Columns)
+# For 1-dimensional arrays, complexity is O(lg2n) to find one peak, and O(n)
+# to find all of them
+# For 2-dimensional arrays, complexity is O(columns*lg2Rows) with the "rows"
+# algorithm and O(rows+columns) with the "window" algorithm
+#
+# Any sequence type is supported (lists, array.array, memoryview, NumPy
+# arrays): we only use len() and indexing, and no recursion. 2D memory views
+# (e.g. a flat buffer cast with a [rows, columns] shape) are split into
+# 1-dimensional row views, since their sub-views are not implemented.
 
 
-def find_peak_1d(array: List[int]) -> Optional[int]:
+def find_peak_1d(array: Sequence[int]) -> Optional[int]:
     """Find any peak in the 1-dimensional array.
 
     By definition, an array "a" contains a peak only if, for a given element
     at position "i", we have that a[i] >= a[i-1] and a[i] >= a[i+1].
     """
-    if not array:
+    if len(array) == 0:
         return None
-    return _find_peak_1d(array, 0, len(array))
 
+    # Binary search: if the next element is bigger, there must be a peak on
+    # its side (values cannot increase forever), otherwise there is a peak on
+    # this side, including the current element.
+    start = 0
+    end = len(array) - 1
+    while start < end:
+        middle = (start + end) // 2
 
-def _find_peak_1d(array: List[int], start: int, end: int) -> Optional[int]:
+        if array[middle] < array[middle + 1]:
+            start = middle + 1
+        else:
+            end = middle
 
-    middle: int = (start + end) // 2
+    return start
 
-    # left bigger than current, go left
-    if middle > 0 and array[middle - 1] > array[middle]:
-        return _find_peak_1d(array, start, middle - 1)
 
-    if middle < len(array) - 1 and array[middle + 1] > array[middle]:
-        return _find_peak_1d(array, middle + 1, end)
+def find_all_peaks_1d(
+    array: Sequence[int],
+    min_prominence: Optional[int] = None,
+    min_distance: Optional[int] = None,
+) -> list[int]:
+    """Find all the local maxima in the 1-dimensional array.
 
-    return middle
+    As for find_peak_1d(), elements outside the array are considered smaller
+    than any element, so the first and last elements may be peaks. A run of
+    equal values (a plateau) is a single peak when both its neighbours are
+    smaller, reported at its middle position.
+
+    The prominence of a peak is how much it stands out: its height above the
+    highest of the two lowest points met moving left and right from the peak
+    until a higher element (or the end of the array) is found.
+
+    Args:
+        array: the values to search
+        min_prominence: if specified, only peaks with at least this
+            prominence are returned
+        min_distance: if specified, peaks closer than this are removed,
+            starting from the lowest ones, until all remaining peaks are at
+            least this far apart
+
+    Returns:
+        the positions of the peaks, in ascending order
+    """
+    peaks = list(_iter_local_maxima(array))
+
+    if min_distance is not None and min_distance > 1:
+        peaks = _filter_by_distance(array, peaks, min_distance)
+
+    if min_prominence is not None:
+        peaks = [
+            peak
+            for peak, prominence in zip(
+                peaks, _peak_prominences(array, peaks), strict=True
+            )
+            if prominence >= min_prominence
+        ]
+
+    return peaks
+
+
+def find_top_peaks_1d(
+    array: Sequence[int],
+    k: int,
+    min_prominence: Optional[int] = None,
+    min_distance: Optional[int] = None,
+) -> list[int]:
+    """Find the k highest local maxima in the 1-dimensional array.
+
+    Args:
+        array: the values to search
+        k: the max number of peaks to return
+        min_prominence: see find_all_peaks_1d()
+        min_distance: see find_all_peaks_1d()
+
+    Returns:
+        the positions of the highest peaks, from the highest to the lowest
+        (equal peaks in ascending position order)
+    """
+    peaks = find_all_peaks_1d(array, min_prominence, min_distance)
+    return nlargest(k, peaks, key=array.__getitem__)
+
+
+def iter_peaks_1d(chunks: Iterable[Iterable[int]]) -> Iterator[int]:
+    """Lazily find all the local maxima of a signal split into chunks.
+
+    Peaks are the same found by find_all_peaks_1d() on the whole signal,
+    including plateaus that straddle chunk boundaries: only the current
+    plateau is tracked, so chunks can be read one at a time from a file or a
+    device. A peak is produced as soon as the first smaller value after it
+    is read.
+
+    Args:
+        chunks: the consecutive pieces of the signal
+
+    Yields:
+        the positions of the peaks in the whole signal, in ascending order
+    """
+    yield from _iter_local_maxima(chain.from_iterable(chunks))
+
+
+def _iter_local_maxima(values: Iterable[int]) -> Iterator[int]:
+    # Single pass over the values, tracking the start of the current plateau
+    # and whether values were rising before it
+    plateau_start = 0
+    rising = True
+    previous: Optional[int] = None
+    position = -1
+
+    for position, value in enumerate(values):
+        if previous is not None and value != previous:
+            if value < previous and rising:
+                yield (plateau_start + position - 1) // 2
+            rising = value > previous
+            plateau_start = position
+
+        previous = value
+
+    if position >= 0 and rising:
+        yield (plateau_start + position) // 2
+
+
+def _filter_by_distance(
+    array: Sequence[int], peaks: list[int], min_distance: int
+) -> list[int]:
+    # Starting from the highest peaks, remove lower peaks that are too close
+    keep = bytearray([1]) * len(peaks)
+    by_height = sorted(range(len(peaks)), key=lambda i: array[peaks[i]], reverse=True)
+
+    for i in by_height:
+        if not keep[i]:
+            continue
+
+        j = i - 1
+        while j >= 0 and peaks[i] - peaks[j] < min_distance:
+            keep[j] = 0
+            j -= 1
+
+        j = i + 1
+        while j < len(peaks) and peaks[j] - peaks[i] < min_distance:
+            keep[j] = 0
+            j += 1
+
+    return [peak for peak, kept in zip(peaks, keep, strict=True) if kept]
+
+
+def _peak_prominences(array: Sequence[int], peaks: list[int]) -> list[int]:
+    if not peaks:
+        return []
+
+    left_bases = _peak_bases(array, peaks, range(len(array)))
+    right_bases = _peak_bases(array, peaks, range(len(array) - 1, -1, -1))
+
+    return [array[peak] - max(left_bases[peak], right_bases[peak]) for peak in peaks]
+
+
+def _peak_bases(
+    array: Sequence[int], peaks: list[int], positions: Iterable[int]
+) -> dict[int, int]:
+    # Lowest value between every peak and the previous higher element, in the
+    # order of positions, using a monotonic stack: it contains the values not
+    # followed yet by a higher or equal one, each with the lowest value since
+    # the previous entry. Every value is pushed and popped at most once.
+    peaks_set = set(peaks)
+    bases: dict[int, int] = {}
+    stack: list[tuple[int, int]] = []
+
+    for position in positions:
+        value = array[position]
+        lowest = value
+        while stack and stack[-1][0] <= value:
+            lowest = min(lowest, stack.pop()[1])
+
+        if position in peaks_set:
+            bases[position] = lowest
+
+        stack.append((value, lowest))
+
+    return bases
 
 
 @dataclass
@@ -44,39 +224,357 @@ class Peak2D:
     column: Optional[int]
 
 
-def find_peak_2d(array_2d: List[List[int]]) -> Optional[Peak2D]:
+# Supported 2D algorithms:
+# * "rows" binary searches the rows, scanning a full row at every step
+# * "window" halves the rows and the columns alternately, scanning only the
+#   dividing row or column of the current window at every step
+PeakAlgorithm2D = Literal["rows", "window"]
+
+# Array typecodes of native integers, as accepted by memoryview.cast()
+IntTypecode = Literal["b", "B", "h", "H", "i", "I", "l", "L", "q", "Q"]
+
+
+def find_peak_2d(
+    array_2d: Sequence[Sequence[int]] | memoryview,
+    algorithm: PeakAlgorithm2D = "rows",
+) -> Optional[Peak2D]:
     """Find a peak in a bidimensional array.
 
     In a matrix, there is a peak if and only if, given an element (i,j),
     the elements respectively on top, bottom, left and right are all
     less or equal than (i,j).
+
+    Args:
+        array_2d: the matrix to search, as a sequence of rows or as a
+            2-dimensional memory view
+        algorithm: the search strategy, "rows" is O(columns*lg2Rows) while
+            "window" is O(rows+columns), which is better for large matrices
+
+    Returns:
+        the position of a peak, or None if the matrix is empty
+
+    Raises:
+        ValueError: if the algorithm is not supported, or if array_2d is a
+            memory view that is not 2-dimensional
     """
-    if not array_2d or not array_2d[0]:
+    if algorithm not in ("rows", "window"):
+        raise ValueError(f"Unsupported peak finding algorithm: {algorithm}")
+
+    if isinstance(array_2d, memoryview):
+        array_2d = _split_rows(array_2d)
+
+    if len(array_2d) == 0 or len(array_2d[0]) == 0:
         return None
 
-    return _find_peak_2d(array_2d, 0, len(array_2d))
+    if algorithm == "window":
+        return _find_peak_2d_window(array_2d)
 
+    # Binary search on rows: the max of the middle row is a peak unless the
+    # element above or below it is bigger, and in that case there must be a
+    # peak in that half (its rows max is bigger than anything in this row).
+    start_row = 0
+    end_row = len(array_2d)
+    while True:
+        middle_row = (start_row + end_row) // 2
 
-def _find_peak_2d(
-    array_2d: List[List[int]], start_row: int, end_row: int
-) -> Optional[Peak2D]:
-    middle_row: int = (start_row + end_row) // 2
+        row = array_2d[middle_row]
+        max_value_col = _argmax(row)
+        max_value = row[max_value_col]
 
-    max_value_col: int = cast(int, find_peak_1d(array_2d[middle_row]))
+        if (
+            middle_row > start_row
+            and array_2d[middle_row - 1][max_value_col] > max_value
+        ):
+            end_row = middle_row
+        elif (
+            middle_row < end_row - 1
+            and array_2d[middle_row + 1][max_value_col] > max_value
+        ):
+            start_row = middle_row + 1
+        else:
+            return Peak2D(middle_row, max_value_col)
 
-    # left bigger than current, go left
-    if (
-        middle_row > 0
-        and array_2d[middle_row - 1][max_value_col]
-        > array_2d[middle_row][max_value_col]
-    ):
-        return _find_peak_2d(array_2d, start_row, middle_row - 1)
 
-    if (
-        middle_row < len(array_2d) - 1
-        and array_2d[middle_row + 1][max_value_col]
-        > array_2d[middle_row][max_value_col]
+def find_peaks_batch(
+    stack: Sequence[Sequence[Sequence[int]]],
+    algorithm: PeakAlgorithm2D = "rows",
+    workers: Optional[int] = None,
+) -> list[Optional[Peak2D]]:
+    """Find a peak in every frame of a stack of bidimensional arrays.
+
+    Args:
+        stack: the frames to search (e.g. a list of matrices or a 3D NumPy
+            array)
+        algorithm: the search strategy, see find_peak_2d()
+        workers: the number of worker processes, each one searching a
+            contiguous range of frames (default: search in the current
+            process)
+
+    Returns:
+        the peak of every frame, in the same order as the frames
+
+    Raises:
+        ValueError: if the algorithm is not supported
+    """
+    if algorithm not in ("rows", "window"):
+        raise ValueError(f"Unsupported peak finding algorithm: {algorithm}")
+
+    if workers is None or workers <= 1 or len(stack) <= 1:
+        return _find_peaks_in_frames(stack, algorithm)
+
+    chunk_size = -(-len(stack) // workers)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                _find_peaks_in_frames, stack[start : start + chunk_size], algorithm
+            )
+            for start in range(0, len(stack), chunk_size)
+        ]
+        return [peak for future in futures for peak in future.result()]
+
+
+def find_peaks_in_file(
+    path: str,
+    rows: int,
+    columns: int,
+    typecode: IntTypecode = "q",
+    algorithm: PeakAlgorithm2D = "rows",
+    workers: Optional[int] = None,
+) -> list[Peak2D]:
+    """Find a peak in every frame stored in a binary file.
+
+    The file contains the frames one after the other, every frame stored row
+    by row as native integers of the given array typecode (e.g. "B" for 8 bit
+    grayscale images), with no header. The file is memory mapped, so it is
+    never fully loaded into memory: only the rows visited by the search are
+    read from disk.
+
+    Args:
+        path: the binary file to read from
+        rows: the number of rows of every frame
+        columns: the number of columns of every frame
+        typecode: the array typecode of the values, one of the integer typecodes
+        algorithm: the search strategy, see find_peak_2d()
+        workers: the number of worker processes, each one mapping the file
+            and searching a contiguous range of frames (default: search in the
+            current process)
+
+    Returns:
+        the peak of every frame, in the same order as the frames
+
+    Raises:
+        ValueError: if the arguments are not valid, or the file size is not
+            a multiple of the frame size
+    """
+    if algorithm not in ("rows", "window"):
+        raise ValueError(f"Unsupported peak finding algorithm: {algorithm}")
+
+    if rows < 1 or columns < 1:
+        raise ValueError("rows and columns must be >= 1")
+
+    frame_size = rows * columns * array(typecode).itemsize
+    file_size = os.path.getsize(path)
+    if file_size % frame_size != 0:
+        raise ValueError(
+            f"File size {file_size} is not a multiple of the frame size {frame_size}"
+        )
+
+    n_frames = file_size // frame_size
+    if n_frames == 0:
+        return []
+
+    if workers is None or workers <= 1 or n_frames <= 1:
+        return _find_peaks_in_file_range(
+            path, rows, columns, typecode, algorithm, 0, n_frames
+        )
+
+    chunk_size = -(-n_frames // workers)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                _find_peaks_in_file_range,
+                path,
+                rows,
+                columns,
+                typecode,
+                algorithm,
+                start,
+                min(start + chunk_size, n_frames),
+            )
+            for start in range(0, n_frames, chunk_size)
+        ]
+        return [peak for future in futures for peak in future.result()]
+
+
+def _find_peaks_in_frames(
+    frames: Sequence[Sequence[Sequence[int]]], algorithm: PeakAlgorithm2D
+) -> list[Optional[Peak2D]]:
+    return [find_peak_2d(frame, algorithm) for frame in frames]
+
+
+def _find_peaks_in_file_range(
+    path: str,
+    rows: int,
+    columns: int,
+    typecode: IntTypecode,
+    algorithm: PeakAlgorithm2D,
+    start_frame: int,
+    end_frame: int,
+) -> list[Peak2D]:
+    # Also runs in worker processes: every frame is exposed as a list of
+    # memory views on its rows, so values are read from the mapped file
+    # only when the search visits them
+    frame_length = rows * columns
+    peaks: list[Peak2D] = []
+
+    with open(path, "rb") as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped_file:
+        view = memoryview(mapped_file).cast(typecode)
+        try:
+            for frame in range(start_frame, end_frame):
+                frame_offset = frame * frame_length
+                frame_rows = [
+                    view[offset : offset + columns]
+                    for offset in range(
+                        frame_offset, frame_offset + frame_length, columns
+                    )
+                ]
+                try:
+                    peaks.append(cast(Peak2D, find_peak_2d(frame_rows, algorithm)))
+                finally:
+                    # All views must be released before closing the mapping
+                    for frame_row in frame_rows:
+                        frame_row.release()
+        finally:
+            view.release()
+
+    return peaks
+
+
+def _find_peak_2d_window(array_2d: Sequence[Sequence[int]]) -> Peak2D:
+    # The window [start_row, end_row) x [start_col, end_col) always contains
+    # a peak: best_seen is the biggest element found so far inside it, and it
+    # is bigger than anything on the dividers previously scanned around it,
+    # so climbing from it can never leave the window.
+    # Halving rows and columns alternately, the scanned dividers have length
+    # columns + rows/2 + columns/2 + rows/4 + ..., that is O(rows+columns).
+    start_row = 0
+    end_row = len(array_2d)
+    start_col = 0
+    end_col = len(array_2d[0])
+
+    best_seen: Optional[tuple[int, int]] = None
+    best_seen_value = 0
+    split_rows = True
+    while True:
+        if split_rows:
+            divider_row = (start_row + end_row) // 2
+            row = array_2d[divider_row]
+            peak = (divider_row, start_col + _argmax(row[start_col:end_col]))
+        else:
+            divider_col = (start_col + end_col) // 2
+            divider_row = max(
+                range(start_row, end_row),
+                key=lambda r: array_2d[r][divider_col],
+            )
+            peak = (divider_row, divider_col)
+
+        neighbour = _better_neighbour(
+            array_2d, peak, start_row, end_row, start_col, end_col
+        )
+        neighbour_value = array_2d[neighbour[0]][neighbour[1]]
+        if best_seen is None or neighbour_value > best_seen_value:
+            best_seen = neighbour
+            best_seen_value = neighbour_value
+
+        if neighbour == peak and neighbour_value >= best_seen_value:
+            return Peak2D(*peak)
+
+        # best_seen is bigger than the divider max, so it lays on one side
+        if split_rows:
+            if best_seen[0] < divider_row:
+                end_row = divider_row
+            else:
+                start_row = divider_row + 1
+        else:
+            if best_seen[1] < divider_col:
+                end_col = divider_col
+            else:
+                start_col = divider_col + 1
+
+        split_rows = not split_rows
+
+
+def _better_neighbour(
+    array_2d: Sequence[Sequence[int]],
+    position: tuple[int, int],
+    start_row: int,
+    end_row: int,
+    start_col: int,
+    end_col: int,
+) -> tuple[int, int]:
+    # The biggest neighbour inside the window if bigger than the element at
+    # position, otherwise position itself
+    row, column = position
+    best = position
+    best_value = array_2d[row][column]
+
+    for neighbour_row, neighbour_col in (
+        (row - 1, column),
+        (row + 1, column),
+        (row, column - 1),
+        (row, column + 1),
     ):
-        return _find_peak_2d(array_2d, middle_row + 1, end_row)
+        if (
+            start_row <= neighbour_row < end_row
+            and start_col <= neighbour_col < end_col
+            and array_2d[neighbour_row][neighbour_col] > best_value
+        ):
+            best = (neighbour_row, neighbour_col)
+            best_value = array_2d[neighbour_row][neighbour_col]
+
+    return best
+
+
+def _split_rows(view: memoryview) -> Sequence[Sequence[int]]:
+    # Rows of a 2-dimensional memory view, as slices of the same buffer seen
+    # as 1-dimensional, so no value is copied
+    if view.ndim != 2:
+        raise ValueError(f"Expected a 2-dimensional memory view, not {view.ndim}")
+
+    if not view.c_contiguous:
+        # Only C-contiguous views can be cast, copy the values instead
+        return cast(list[list[int]], view.tolist())
+
+    n_rows, n_columns = view.shape or (0, 0)
+    if n_columns == 0:
+        return []
+
+    flat_view = view.cast("B").cast(cast(IntTypecode, view.format))
+    return [
+        flat_view[start : start + n_columns]
+        for start in range(0, n_rows * n_columns, n_columns)
+    ]
+
+
+def _argmax(row: Sequence[int]) -> int:
+    # Position of the (first) max value in the row, using the fastest
+    # available option for the row type
+    argmax = getattr(row, "argmax", None)
+    if argmax is not None:
+        # NumPy arrays, vectorised
+        return int(argmax())
+
+    index = getattr(row, "index", None)
+    if index is not None:
+        # Lists and array.array, two passes in C
+        return int(index(max(row)))
+
+    tolist = getattr(row, "tolist", None)
+    if tolist is not None:
+        # Memory views, copying the row is faster than indexing it from Python
+        values = tolist()
+        return int(values.index(max(values)))
 
-    return Peak2D(middle_row, max_value_col)
+    return max(range(len(row)), key=row.__getitem__)
@@ -1,7 +1,13 @@
 """Graph traversal algorithms."""
 
+from array import array
+from collections import deque
+from enum import Enum
 from typing import Callable
+from typing import Iterator
+from typing import Optional
 
+from my_python_kata.datastructures.graphs import FrozenGraph
 from my_python_kata.datastructures.graphs import Graph
 from my_python_kata.datastructures.graphs import K
 from my_python_kata.datastructures.graphs import T
@@ -12,7 +18,9 @@ GraphActionCallback = Callable[[K], bool]
 
 
 def bft(
-    graph: Graph[K, T], start_node: K, on_node_action: GraphActionCallback[K]
+    graph: Graph[K, T] | FrozenGraph[K, T],
+    start_node: K,
+    on_node_action: GraphActionCallback[K],
 ) -> None:
     """Breadt-First traversal.
 
@@ -27,23 +35,219 @@ def bft(
         start_node: the node to start traversal from
         on_node_action: a callback that will be invoked on each traversal.
     """
+    for node, _ in iter_bft(graph, start_node):
+        # We allow clients to quit the traversal, if they return False in the
+        # action callback.
+        if not on_node_action(node):
+            return
+
+
+def iter_bft(
+    graph: Graph[K, T] | FrozenGraph[K, T], start_node: K
+) -> Iterator[tuple[K, int]]:
+    """Lazy Breadth-First traversal.
+
+    Yields the nodes reachable from the start node, in Breadth-First order,
+    together with their depth (the start node has depth 0). The connected nodes
+    of a node are only explored when the next item is requested, so clients
+    can stop the traversal at any time.
+
+    Every node is enqueued at most once, since it is marked as visited as soon
+    as it is discovered: complexity is O(V + E).
+
+    Args:
+        graph: the graph to be processed
+        start_node: the node to start traversal from
+
+    Yields:
+        (node, depth) tuples
+    """
+    if isinstance(graph, FrozenGraph):
+        yield from _iter_bft_frozen(graph, start_node)
+        return
+
     if not graph.contains(start_node):
         return
 
-    fringe_nodes: list[K] = [start_node]
-    visited_nodes: set[K] = set()
+    fringe_nodes: deque[tuple[K, int]] = deque([(start_node, 0)])
+    visited_nodes: set[K] = {start_node}
 
     while fringe_nodes:
-        current_node = fringe_nodes.pop(0)
+        current_node, depth = fringe_nodes.popleft()
 
-        # We allow clients to quit the traversal, if they return False in the
-        # action callback.
-        # Quickest way is to clear the current fringe so nothing will happen
-        if on_node_action(current_node):
-            visited_nodes.add(current_node)
+        yield current_node, depth
 
-            for connected_node in graph.get_connected_nodes(current_node):
+        depth += 1
+        for connected_node in graph.get_connected_nodes(current_node):
+            if connected_node not in visited_nodes:
+                visited_nodes.add(connected_node)
+                fringe_nodes.append((connected_node, depth))
+
+
+def _iter_bft_frozen(
+    graph: FrozenGraph[K, T], start_node: K
+) -> Iterator[tuple[K, int]]:
+    # Same traversal as iter_bft(), but working on the dense node ids of the
+    # frozen graph: the fringe holds ints and the depth of every discovered
+    # node is kept in a typed array, where -1 means "not visited yet"
+    start_id = graph.get_node_id(start_node)
+    if start_id is None:
+        return
+
+    fringe_ids: deque[int] = deque([start_id])
+    depths = array("i", [-1]) * graph.size()
+    depths[start_id] = 0
+
+    while fringe_ids:
+        current_id = fringe_ids.popleft()
+        depth = depths[current_id]
+
+        yield graph.get_node(current_id), depth
+
+        depth += 1
+        for connected_id in graph.get_connected_ids(current_id):
+            if depths[connected_id] < 0:
+                depths[connected_id] = depth
+                fringe_ids.append(connected_id)
+
+
+class DftEvent(Enum):
+    """Events generated by Depth-First traversals."""
+
+    # The node has been reached for the first time (pre-order)
+    DISCOVER = "discover"
+    # All the nodes reachable from the node have been visited (post-order)
+    FINISH = "finish"
+
+
+def dft(
+    graph: Graph[K, T] | FrozenGraph[K, T],
+    start_node: Optional[K],
+    on_node_discover: GraphActionCallback[K],
+    on_node_finish: Optional[GraphActionCallback[K]] = None,
+) -> None:
+    """Depth-First traversal.
+
+    Performs Depth-First Traversal of the given graph, starting from the
+    specified node and invoking the callbacks when a node is discovered
+    (pre-order) and finished (post-order).
+
+    Callback actions must return True if they want to continue traversal or
+    False if they want to stop after processing the current node.
+
+    Args:
+        graph: the graph to be processed
+        start_node: the node to start traversal from, or None for visiting
+            all the nodes of the graph
+        on_node_discover: a callback invoked when a node is discovered
+        on_node_finish: a callback invoked when a node is finished (optional)
+    """
+    for node, event in iter_dft(graph, start_node):
+        if event is DftEvent.DISCOVER:
+            if not on_node_discover(node):
+                return
+        elif on_node_finish is not None and not on_node_finish(node):
+            return
+
+
+def iter_dft(
+    graph: Graph[K, T] | FrozenGraph[K, T], start_node: Optional[K] = None
+) -> Iterator[tuple[K, DftEvent]]:
+    """Lazy Depth-First traversal.
+
+    Yields a (node, DftEvent.DISCOVER) tuple when a node is reached for the
+    first time and a (node, DftEvent.FINISH) tuple when all the nodes reachable
+    from it have been visited, which is what topological sort, cycle detection
+    and strongly connected components algorithms are built on.
+
+    The traversal uses an explicit stack of (node, connected nodes iterator)
+    pairs instead of recursion, so there is no limit on the depth of the graph
+    and complexity is O(V + E).
+
+    Args:
+        graph: the graph to be processed
+        start_node: the node to start traversal from. If None, the traversal
+            restarts from every node not visited yet, in graph order, so that
+            the whole graph is visited.
+
+    Yields:
+        (node, event) tuples
+    """
+    if isinstance(graph, FrozenGraph):
+        yield from _iter_dft_frozen(graph, start_node)
+        return
+
+    if start_node is None:
+        root_nodes = graph.get_nodes()
+    elif graph.contains(start_node):
+        root_nodes = [start_node]
+    else:
+        return
+
+    visited_nodes: set[K] = set()
+
+    for root_node in root_nodes:
+        if root_node in visited_nodes:
+            continue
+
+        visited_nodes.add(root_node)
+        yield root_node, DftEvent.DISCOVER
+
+        stack = [(root_node, iter(graph.get_connected_nodes(root_node)))]
+
+        while stack:
+            current_node, connected_nodes = stack[-1]
+
+            # Resume from where we left the connected nodes of the current node,
+            # so every edge is examined only once
+            for connected_node in connected_nodes:
                 if connected_node not in visited_nodes:
-                    fringe_nodes.append(connected_node)
-        else:
-            fringe_nodes.clear()
+                    visited_nodes.add(connected_node)
+                    yield connected_node, DftEvent.DISCOVER
+
+                    next_nodes = graph.get_connected_nodes(connected_node)
+                    stack.append((connected_node, iter(next_nodes)))
+                    break
+            else:
+                stack.pop()
+                yield current_node, DftEvent.FINISH
+
+
+def _iter_dft_frozen(
+    graph: FrozenGraph[K, T], start_node: Optional[K]
+) -> Iterator[tuple[K, DftEvent]]:
+    # Same traversal as iter_dft(), but working on the dense node ids of the
+    # frozen graph
+    if start_node is None:
+        root_ids: range | list[int] = range(graph.size())
+    else:
+        start_id = graph.get_node_id(start_node)
+        if start_id is None:
+            return
+        root_ids = [start_id]
+
+    visited_ids = bytearray(graph.size())
+
+    for root_id in root_ids:
+        if visited_ids[root_id]:
+            continue
+
+        visited_ids[root_id] = 1
+        yield graph.get_node(root_id), DftEvent.DISCOVER
+
+        stack = [(root_id, iter(graph.get_connected_ids(root_id)))]
+
+        while stack:
+            current_id, connected_ids = stack[-1]
+
+            for connected_id in connected_ids:
+                if not visited_ids[connected_id]:
+                    visited_ids[connected_id] = 1
+                    yield graph.get_node(connected_id), DftEvent.DISCOVER
+
+                    next_ids = graph.get_connected_ids(connected_id)
+                    stack.append((connected_id, iter(next_ids)))
+                    break
+            else:
+                stack.pop()
+                yield graph.get_node(current_id), DftEvent.FINISH
@@ -1,22 +1,335 @@
-"""Module that exposes how to merge two lists into one single list."""
+"""Module that exposes how to merge sorted lists into one single list."""
 
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heapify
+from heapq import heappop
+from heapq import heapreplace
+from itertools import chain
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+from typing import Callable
+from typing import Final
+from typing import Iterable
+from typing import Iterator
+from typing import Literal
+from typing import Optional
+from typing import Sequence
+from typing import TypeVar
+from typing import cast
 
-def merge_arrays(arrays: list[list[int]]) -> list[int]:
-    """Given n sorted arrays as input, generate a single sorted array as output."""
+
+# Generic type for the merged values
+V = TypeVar("V")
+
+
+# Up to this number of arrays, merging them in pairs is faster than using a heap
+# (fewer passes on the data and no heap bookkeeping)
+MAX_PAIRWISE_MERGE_ARRAYS = 4
+
+# Supported merge strategies:
+# * "python" merges values one by one, with Python code
+# * "sort" concatenates the arrays and sorts the result: Timsort detects the
+#   sorted runs and merges them in C, with no per-element Python code
+MergeBackend = Literal["python", "sort"]
+
+# When merging in parallel, values are partitioned using splitters chosen
+# from a sample of about this many values per partition
+SAMPLES_PER_PARTITION = 64
+
+# Values are shared with worker processes as native signed 64 bit integers
+_TYPECODE: Final = "q"
+
+
+def merge_arrays(
+    arrays: Sequence[Sequence[int]],
+    backend: Optional[MergeBackend] = None,
+    workers: Optional[int] = None,
+) -> list[int]:
+    """Given n sorted arrays as input, generate a single sorted array as output.
+
+    With the "python" backend, a few arrays are merged in pairs using a
+    balanced divide-and-conquer strategy, otherwise the arrays are merged
+    using iter_merge(). In both cases, merging k arrays of total size N is
+    O(N lg2 k).
+
+    With the "sort" backend, arrays are concatenated and sorted in place,
+    which is much faster for large numeric inputs.
+
+    With more than one worker, the values are partitioned into value ranges
+    using splitters sampled from the arrays, and every partition is merged by
+    a separate process (see _merge_in_parallel()). Values must fit into
+    signed 64 bit integers.
+
+    Args:
+        arrays: the sorted arrays to merge
+        backend: the merge strategy. By default, "python" is used for lists
+            while "sort" is used for any other sequence type, e.g.
+            array.array or memory views
+        workers: the number of worker processes (default: merge in the
+            current process)
+
+    Returns:
+        the merged array
+
+    Raises:
+        ValueError: if the backend is not supported
+    """
     if not arrays:
         return []
 
+    if backend is None:
+        backend = (
+            "python" if all(isinstance(array, list) for array in arrays) else "sort"
+        )
+
+    if backend not in ("python", "sort"):
+        raise ValueError(f"Unsupported merge backend: {backend}")
+
+    if workers is not None and workers > 1:
+        return _merge_in_parallel(arrays, backend, workers)
+
+    if backend == "sort":
+        return _merge_with_sort(arrays)
+
     if len(arrays) == 1:
-        return arrays[0]
+        return arrays[0] if isinstance(arrays[0], list) else list(arrays[0])
+
+    if len(arrays) <= MAX_PAIRWISE_MERGE_ARRAYS:
+        return _merge_pairwise(arrays)
+
+    return list(iter_merge(*arrays))
+
+
+def iter_merge(
+    *iterables: Iterable[V], key: Optional[Callable[[V], Any]] = None
+) -> Iterator[V]:
+    """Lazily merge sorted iterables into a single sorted stream of values.
+
+    This is a k-way merge using a heap, which contains the next value of every
+    iterable that has not been fully consumed yet: only one value per iterable
+    is kept in memory, so it works with generators, file readers or memory
+    mapped arrays larger than the available memory. The merge is stable: equal
+    values are produced in the order of the iterables.
+
+    Args:
+        iterables: the sorted iterables to merge
+        key: a function extracting the comparison key from a value
+            (default: values are compared directly)
+
+    Yields:
+        the merged values
+    """
+    # Heap entries are [key, iterable index, value, iterator] lists, updated
+    # in place. The index breaks ties, so values and iterators are never
+    # compared.
+    heap: list[list[Any]] = []
+
+    for i, iterable in enumerate(iterables):
+        iterator = iter(iterable)
+        for value in iterator:
+            heap.append([key(value) if key else value, i, value, iterator])
+            break
+
+    heapify(heap)
+
+    while len(heap) > 1:
+        entry = heap[0]
+        yield entry[2]
+
+        for value in entry[3]:
+            entry[0] = key(value) if key else value
+            entry[2] = value
+            heapreplace(heap, entry)
+            break
+        else:
+            heappop(heap)
+
+    # Only one iterable left, no need to compare values anymore
+    if heap:
+        yield heap[0][2]
+        yield from heap[0][3]
 
-    merged: list[int] = arrays[0].copy()
-    for i in range(1, len(arrays)):
-        merged = _merge_two_arrays(merged, arrays[i])
 
+def _merge_in_parallel(
+    arrays: Sequence[Sequence[int]], backend: MergeBackend, workers: int
+) -> list[int]:
+    # Input arrays are copied, one after the other, into a shared memory block
+    # so that worker processes can read them without pickling.
+    # Every worker merges the values of one partition (a value range) and
+    # writes them directly at their final position into the output shared
+    # memory block: the offset of a partition is the number of values in the
+    # previous partitions, which is known in advance.
+    array_lengths = [len(values) for values in arrays]
+    total_length = sum(array_lengths)
+    if total_length == 0:
+        return []
+
+    splitters = _choose_splitters(arrays, total_length, workers)
+
+    # Boundaries of every partition in every array, the first partition
+    # contains values < splitters[0], the last one values >= splitters[-1]
+    boundaries = [
+        [0] + [bisect_left(values, splitter) for splitter in splitters] + [length]
+        for values, length in zip(arrays, array_lengths, strict=True)
+    ]
+
+    input_memory = SharedMemory(create=True, size=total_length * 8)
+    output_memory = SharedMemory(create=True, size=total_length * 8)
+    try:
+        array_offsets = _copy_to_shared_memory(arrays, input_memory)
+
+        tasks = []
+        output_offset = 0
+        for partition in range(len(splitters) + 1):
+            ranges = [
+                (
+                    array_offset + array_boundaries[partition],
+                    array_offset + array_boundaries[partition + 1],
+                )
+                for array_offset, array_boundaries in zip(
+                    array_offsets, boundaries, strict=True
+                )
+                if array_boundaries[partition] < array_boundaries[partition + 1]
+            ]
+            if ranges:
+                tasks.append((ranges, output_offset))
+                output_offset += sum(end - start for start, end in ranges)
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    _merge_partition,
+                    input_memory.name,
+                    output_memory.name,
+                    ranges,
+                    output_offset,
+                    backend,
+                )
+                for ranges, output_offset in tasks
+            ]
+            for future in futures:
+                future.result()
+
+        output_view = _cast_shared_memory(output_memory)
+        merged: list[int] = output_view.tolist()
+        output_view.release()
+
+        return merged
+    finally:
+        for memory in (input_memory, output_memory):
+            memory.close()
+            memory.unlink()
+
+
+def _choose_splitters(
+    arrays: Sequence[Sequence[int]], total_length: int, n_partitions: int
+) -> list[int]:
+    # Sample values at the same regular step in every array, so that every
+    # array contributes in proportion to its length, and pick the quantiles
+    step = max(1, total_length // (n_partitions * SAMPLES_PER_PARTITION))
+
+    samples: list[int] = []
+    for values in arrays:
+        samples.extend(values[i] for i in range(step // 2, len(values), step))
+    samples.sort()
+
+    if not samples:
+        return []
+
+    return [
+        samples[len(samples) * partition // n_partitions]
+        for partition in range(1, n_partitions)
+    ]
+
+
+def _copy_to_shared_memory(
+    arrays: Sequence[Sequence[int]], memory: SharedMemory
+) -> list[int]:
+    # Returns the offset of every array in the shared memory block
+    view = _cast_shared_memory(memory)
+    try:
+        offsets: list[int] = []
+        offset = 0
+        for values in arrays:
+            offsets.append(offset)
+            view[offset : offset + len(values)] = array(_TYPECODE, values)
+            offset += len(values)
+
+        return offsets
+    finally:
+        view.release()
+
+
+def _cast_shared_memory(memory: SharedMemory) -> memoryview:
+    # View on the values of a shared memory block, as native signed 64 bit
+    # integers (the buffer is None only once the block is closed)
+    buffer = memory.buf
+    if buffer is None:
+        raise ValueError(f"Shared memory block {memory.name} is closed")
+
+    return buffer.cast(_TYPECODE)
+
+
+def _merge_partition(
+    input_name: str,
+    output_name: str,
+    ranges: list[tuple[int, int]],
+    output_offset: int,
+    backend: MergeBackend,
+) -> None:
+    # Runs in a worker process: merge the given ranges of the input shared
+    # memory block and write the result into the output shared memory block
+    input_memory = SharedMemory(name=input_name)
+    output_memory = SharedMemory(name=output_name)
+
+    input_view = _cast_shared_memory(input_memory)
+    output_view = _cast_shared_memory(output_memory)
+    runs = [input_view[start:end] for start, end in ranges]
+    try:
+        merged = merge_arrays(runs, backend)
+        output_view[output_offset : output_offset + len(merged)] = array(
+            _TYPECODE, merged
+        )
+    finally:
+        # All views must be released before closing the shared memory blocks
+        for run in runs:
+            run.release()
+        input_view.release()
+        output_view.release()
+
+        input_memory.close()
+        output_memory.close()
+
+
+def _merge_with_sort(arrays: Sequence[Sequence[int]]) -> list[int]:
+    # Timsort finds the sorted runs of the concatenated arrays and merges
+    # them, galloping through the parts where one run wins many times in a row
+    merged = list(chain.from_iterable(arrays))
+    merged.sort()
     return merged
 
 
-def _merge_two_arrays(first: list[int], second: list[int]) -> list[int]:
+def _merge_pairwise(arrays: Sequence[Sequence[int]]) -> list[int]:
+    # Merge arrays in pairs, halving their number at every pass, so every
+    # element is copied lg2(k) times instead of k times
+    merged_arrays: Sequence[Sequence[int]] = arrays
+    while len(merged_arrays) > 1:
+        next_merged_arrays: list[Sequence[int]] = [
+            _merge_two_arrays(merged_arrays[i], merged_arrays[i + 1])
+            for i in range(0, len(merged_arrays) - 1, 2)
+        ]
+        if len(merged_arrays) % 2 == 1:
+            next_merged_arrays.append(merged_arrays[-1])
+
+        merged_arrays = next_merged_arrays
+
+    # At least one pass was done, so this is the output of _merge_two_arrays()
+    return cast(list[int], merged_arrays[0])
+
+
+def _merge_two_arrays(first: Sequence[int], second: Sequence[int]) -> list[int]:
     i = 0  # index for first array
     j = 0  # index for second array
     merged: list[int] = []
@@ -0,0 +1,275 @@
+"""Shortest paths algorithms."""
+
+from array import array
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Callable
+from typing import Generic
+from typing import Optional
+from typing import cast
+
+from my_python_kata.datastructures.graphs import FrozenGraph
+from my_python_kata.datastructures.graphs import Graph
+from my_python_kata.datastructures.graphs import K
+from my_python_kata.datastructures.graphs import T
+from my_python_kata.datastructures.heaps import IndexedMinHeap
+
+
+@dataclass
+class ShortestPaths(Generic[K]):
+    """Value object containing the result of a single-source shortest path search.
+
+    Only nodes whose distance is final are included: when the search stops
+    early at a target node, nodes that were not settled yet are left out.
+    """
+
+    source: K
+    distances: dict[K, float] = field(default_factory=dict)
+    predecessors: dict[K, Optional[K]] = field(default_factory=dict)
+
+    def path_to(self, target: K) -> list[K]:
+        """Returns the shortest path from the source node to the target node.
+
+        Args:
+            target: the last node of the path
+
+        Returns:
+            the nodes along the path (including source and target), or an empty
+            list if the target was not reached
+        """
+        if target not in self.predecessors:
+            return []
+
+        path: list[K] = []
+        node: Optional[K] = target
+        while node is not None:
+            path.append(node)
+            node = self.predecessors[node]
+        path.reverse()
+
+        return path
+
+
+def dijkstra(
+    graph: Graph[K, T] | FrozenGraph[K, T], source: K, target: Optional[K] = None
+) -> ShortestPaths[K]:
+    """Dijkstra single-source shortest paths, using the edge weights.
+
+    Complexity is O((V + E) lg2 V), since the fringe is an indexed binary heap
+    where tentative distances are decreased in place.
+
+    Args:
+        graph: the graph to be processed (edge weights must not be negative)
+        source: the node to start from
+        target: if specified, the search stops as soon as the distance of this
+            node is known
+
+    Returns:
+        the distances and predecessors of the nodes reached from source
+
+    Raises:
+        ValueError: if a negative edge weight is found
+    """
+    if isinstance(graph, FrozenGraph):
+        return _dijkstra_frozen(graph, source, target)
+
+    result = ShortestPaths[K](source)
+    if not graph.contains(source):
+        return result
+
+    distances = result.distances
+    predecessors = result.predecessors
+    tentative_predecessors: dict[K, Optional[K]] = {source: None}
+
+    fringe = IndexedMinHeap[K, float]([(source, 0.0)])
+
+    while fringe.size() > 0:
+        current_node, current_distance = cast(tuple[K, float], fringe.extract())
+
+        distances[current_node] = current_distance
+        predecessors[current_node] = tentative_predecessors[current_node]
+
+        if current_node == target:
+            break
+
+        for connected_node in graph.get_connected_nodes(current_node):
+            if connected_node in distances:
+                continue
+
+            weight = cast(float, graph.get_edge_weight(current_node, connected_node))
+            if weight < 0:
+                raise ValueError(
+                    f"Negative weight for edge {current_node} -> {connected_node}"
+                )
+
+            new_distance = current_distance + weight
+            old_distance = fringe.get_priority(connected_node)
+
+            if old_distance is None or new_distance < old_distance:
+                fringe.insert(connected_node, new_distance)
+                tentative_predecessors[connected_node] = current_node
+
+    return result
+
+
+def _dijkstra_frozen(
+    graph: FrozenGraph[K, T], source: K, target: Optional[K]
+) -> ShortestPaths[K]:
+    # Same search as dijkstra(), but working on the dense node ids of the
+    # frozen graph, so all bookkeeping lives in typed arrays
+    result = ShortestPaths[K](source)
+
+    source_id = graph.get_node_id(source)
+    if source_id is None:
+        return result
+
+    target_id = graph.get_node_id(target) if target is not None else None
+
+    settled_ids = bytearray(graph.size())
+    predecessor_ids = array("q", [-1]) * graph.size()
+
+    fringe = IndexedMinHeap[int, float]([(source_id, 0.0)])
+
+    while fringe.size() > 0:
+        current_id, current_distance = cast(tuple[int, float], fringe.extract())
+
+        settled_ids[current_id] = 1
+
+        current_node = graph.get_node(current_id)
+        predecessor_id = predecessor_ids[current_id]
+
+        result.distances[current_node] = current_distance
+        result.predecessors[current_node] = (
+            graph.get_node(predecessor_id) if predecessor_id >= 0 else None
+        )
+
+        if current_id == target_id:
+            break
+
+        for connected_id, weight in zip(
+            graph.get_connected_ids(current_id),
+            graph.get_connected_weights(current_id),
+            strict=True,
+        ):
+            if settled_ids[connected_id]:
+                continue
+
+            if weight < 0:
+                raise ValueError(
+                    f"Negative weight for edge {current_node} -> "
+                    f"{graph.get_node(connected_id)}"
+                )
+
+            new_distance = current_distance + weight
+            old_distance = fringe.get_priority(connected_id)
+
+            if old_distance is None or new_distance < old_distance:
+                fringe.insert(connected_id, new_distance)
+                predecessor_ids[connected_id] = current_id
+
+    return result
+
+
+def shortest_hop_path(
+    graph: Graph[K, T] | FrozenGraph[K, T], source: K, target: K
+) -> list[K]:
+    """Bidirectional Breadth-First search of the path with the fewest edges.
+
+    Two Breadth-First searches are run at the same time, one following edges
+    forward from the source and one following edges backward from the target,
+    always expanding the smaller fringe by one level. The search stops as soon
+    as the two meet, so it usually explores far fewer nodes than a Breadth-First
+    traversal from the source only. Edge weights are ignored.
+
+    Args:
+        graph: the graph to be processed
+        source: the first node of the path
+        target: the last node of the path
+
+    Returns:
+        the nodes along the path (including source and target), or an empty
+        list if the target cannot be reached from the source
+    """
+    if not graph.contains(source) or not graph.contains(target):
+        return []
+
+    forward_depths: dict[K, int] = {source: 0}
+    forward_parents: dict[K, Optional[K]] = {source: None}
+    forward_fringe = [source]
+
+    backward_depths: dict[K, int] = {target: 0}
+    backward_parents: dict[K, Optional[K]] = {target: None}
+    backward_fringe = [target]
+
+    meeting_node: Optional[K] = source if source == target else None
+
+    while meeting_node is None and forward_fringe and backward_fringe:
+        if len(forward_fringe) <= len(backward_fringe):
+            forward_fringe, meeting_node = _expand_hop_fringe(
+                forward_fringe,
+                graph.get_connected_nodes,
+                forward_depths,
+                forward_parents,
+                backward_depths,
+            )
+        else:
+            backward_fringe, meeting_node = _expand_hop_fringe(
+                backward_fringe,
+                graph.get_incoming_nodes,
+                backward_depths,
+                backward_parents,
+                forward_depths,
+            )
+
+    if meeting_node is None:
+        return []
+
+    path: list[K] = []
+    node: Optional[K] = meeting_node
+    while node is not None:
+        path.append(node)
+        node = forward_parents[node]
+    path.reverse()
+
+    node = backward_parents[meeting_node]
+    while node is not None:
+        path.append(node)
+        node = backward_parents[node]
+
+    return path
+
+
+def _expand_hop_fringe(
+    fringe: list[K],
+    get_next_nodes: Callable[[K], list[K]],
+    depths: dict[K, int],
+    parents: dict[K, Optional[K]],
+    other_depths: dict[K, int],
+) -> tuple[list[K], Optional[K]]:
+    # Expands a whole level of one of the two searches and returns the new
+    # fringe, together with the best node reached by both searches (if any).
+    # The whole level must be expanded since the nodes met by the other search
+    # may lay at different depths on its side.
+    next_fringe: list[K] = []
+    meeting_node: Optional[K] = None
+    meeting_length = 0
+
+    for current_node in fringe:
+        depth = depths[current_node] + 1
+
+        for next_node in get_next_nodes(current_node):
+            if next_node in depths:
+                continue
+
+            depths[next_node] = depth
+            parents[next_node] = current_node
+            next_fringe.append(next_node)
+
+            other_depth = other_depths.get(next_node, None)
+            if other_depth is not None and (
+                meeting_node is None or depth + other_depth < meeting_length
+            ):
+                meeting_node = next_node
+                meeting_length = depth + other_depth
+
+    return next_fringe, meeting_node
@@ -0,0 +1,345 @@
+"""Binary trees stored as parallel arrays, with integer node indices."""
+
+from __future__ import annotations
+
+from array import array
+from typing import Any
+from typing import Callable
+from typing import Generic
+from typing import Iterator
+from typing import MutableSequence
+from typing import Sequence
+
+from my_python_kata.datastructures import binary_trees
+from my_python_kata.datastructures.binary_trees import K
+from my_python_kata.datastructures.binary_trees import Node
+from my_python_kata.datastructures.binary_trees import V
+
+
+# Index used for missing children (and for the root of an empty tree)
+NO_NODE = -1
+
+# Child indices are stored as native signed 32 bit integers
+_INDEX_TYPECODE = "i"
+
+
+class ArrayTree(Generic[K, V]):
+    """A binary tree whose nodes are addressed by integer indices.
+
+    Differently from binary_trees.Node, there is no Python object per node:
+    keys, values and children of node "i" are stored at position "i" of
+    parallel arrays, so a tree takes a fraction of the memory and traversals
+    only read integers from contiguous arrays.
+
+    Implementation notes:
+     * children are indices into the same arrays, NO_NODE for missing ones.
+     * keys and values are stored into typed arrays when a typecode is given
+       (e.g. "q" for 64 bit integers), otherwise into lists.
+     * nodes are never removed, only added and linked.
+    """
+
+    root: int
+
+    _keys: MutableSequence[Any]
+
+    _values: MutableSequence[Any]
+
+    _left_children: array[int]
+
+    _right_children: array[int]
+
+    def __init__(
+        self, key_typecode: str | None = None, value_typecode: str | None = None
+    ) -> None:
+        """Construct a new empty tree.
+
+        Args:
+            key_typecode: the array typecode of the keys (default: keys are
+                stored into a list)
+            value_typecode: the array typecode of the values (default: values
+                are stored into a list)
+        """
+        self.root = NO_NODE
+
+        self._keys = array(key_typecode) if key_typecode else []
+        self._values = array(value_typecode) if value_typecode else []
+        self._left_children = array(_INDEX_TYPECODE)
+        self._right_children = array(_INDEX_TYPECODE)
+
+    @classmethod
+    def from_node(
+        cls,
+        node: Node[K, V] | None,
+        key_typecode: str | None = None,
+        value_typecode: str | None = None,
+    ) -> ArrayTree[K, V]:
+        """Construct a new tree with the same structure of a tree of nodes.
+
+        Nodes are stored in pre-order, so the root has index 0.
+
+        Args:
+            node: the root of the tree to copy
+            key_typecode: see ArrayTree()
+            value_typecode: see ArrayTree()
+
+        Returns:
+            the new tree
+        """
+        tree = cls(key_typecode, value_typecode)
+
+        indices: dict[int, int] = {}
+        for visited_node in binary_trees.iter_pre_order(node):
+            indices[id(visited_node)] = tree.add_node(
+                visited_node.key, visited_node.value
+            )
+
+        for visited_node in binary_trees.iter_pre_order(node):
+            index = indices[id(visited_node)]
+            if visited_node.left_child:
+                tree.set_left_child(index, indices[id(visited_node.left_child)])
+            if visited_node.right_child:
+                tree.set_right_child(index, indices[id(visited_node.right_child)])
+
+        tree.root = 0 if node else NO_NODE
+
+        return tree
+
+    @classmethod
+    def from_sorted(
+        cls,
+        sorted_items: Sequence[tuple[K, V]],
+        key_typecode: str | None = None,
+        value_typecode: str | None = None,
+    ) -> ArrayTree[K, V]:
+        """Construct a balanced binary search tree from (key, value) pairs.
+
+        As binary_trees.build_balanced(), but nodes are stored in key order:
+        the node index of every pair is its position in sorted_items.
+
+        Args:
+            sorted_items: the (key, value) pairs, sorted by key with no
+                duplicates
+            key_typecode: see ArrayTree()
+            value_typecode: see ArrayTree()
+
+        Returns:
+            the new tree
+        """
+        tree = cls(key_typecode, value_typecode)
+        for key, value in sorted_items:
+            tree.add_node(key, value)
+
+        # Ranges of nodes still to be linked, with their parent and side
+        stack = [(0, len(sorted_items), NO_NODE, False)]
+        while stack:
+            start, end, parent, is_left_child = stack.pop()
+            if start >= end:
+                continue
+
+            middle = (start + end) // 2
+            if parent == NO_NODE:
+                tree.root = middle
+            elif is_left_child:
+                tree.set_left_child(parent, middle)
+            else:
+                tree.set_right_child(parent, middle)
+
+            stack.append((start, middle, middle, True))
+            stack.append((middle + 1, end, middle, False))
+
+        return tree
+
+    def add_node(self, key: K, value: V | None = None) -> int:
+        """Add a new node, with no children.
+
+        The first node added to an empty tree becomes its root.
+
+        Args:
+            key: the key for the node
+            value: the value of the node (optional, not supported when values
+                are stored into a typed array)
+
+        Returns:
+            the index of the new node
+        """
+        index = len(self._keys)
+
+        self._keys.append(key)
+        self._values.append(value)
+        self._left_children.append(NO_NODE)
+        self._right_children.append(NO_NODE)
+
+        if self.root == NO_NODE:
+            self.root = index
+
+        return index
+
+    def size(self) -> int:
+        """Returns the number of nodes in this tree."""
+        return len(self._keys)
+
+    def get_key(self, index: int) -> K:
+        """Returns the key of a node."""
+        key: K = self._keys[index]
+        return key
+
+    def get_value(self, index: int) -> V | None:
+        """Returns the value of a node."""
+        value: V | None = self._values[index]
+        return value
+
+    def set_value(self, index: int, value: V | None) -> None:
+        """Change the value of a node.
+
+        Args:
+            index: the index of the node
+            value: the new value
+        """
+        self._values[index] = value
+
+    def get_left_child(self, index: int) -> int:
+        """Returns the index of the left child of a node, or NO_NODE."""
+        return self._left_children[index]
+
+    def get_right_child(self, index: int) -> int:
+        """Returns the index of the right child of a node, or NO_NODE."""
+        return self._right_children[index]
+
+    def set_left_child(self, index: int, child: int) -> None:
+        """Change the left child of a node.
+
+        Args:
+            index: the index of the node
+            child: the index of the new left child, or NO_NODE
+        """
+        self._left_children[index] = child
+
+    def set_right_child(self, index: int, child: int) -> None:
+        """Change the right child of a node.
+
+        Args:
+            index: the index of the node
+            child: the index of the new right child, or NO_NODE
+        """
+        self._right_children[index] = child
+
+
+# Alias for better readability
+IndexActionCallback = Callable[[int], bool]
+
+
+def visit_in_order(
+    tree: ArrayTree[K, V], index: int, on_node_action: IndexActionCallback
+) -> None:
+    """Visit a tree using in-order strategy.
+
+    See https://en.wikipedia.org/wiki/Tree_traversal.
+    """
+    for visited_index in iter_in_order(tree, index):
+        on_node_action(visited_index)
+
+
+def visit_pre_order(
+    tree: ArrayTree[K, V], index: int, on_node_action: IndexActionCallback
+) -> None:
+    """Visit a tree using pre-order strategy.
+
+    See https://en.wikipedia.org/wiki/Tree_traversal.
+    """
+    for visited_index in iter_pre_order(tree, index):
+        on_node_action(visited_index)
+
+
+def visit_post_order(
+    tree: ArrayTree[K, V], index: int, on_node_action: IndexActionCallback
+) -> None:
+    """Visit a tree using post-order strategy.
+
+    See https://en.wikipedia.org/wiki/Tree_traversal.
+    """
+    for visited_index in iter_post_order(tree, index):
+        on_node_action(visited_index)
+
+
+def iter_in_order(tree: ArrayTree[K, V], index: int) -> Iterator[int]:
+    """Lazily visit a tree using in-order strategy.
+
+    Args:
+        tree: the tree to visit
+        index: the index of the root of the (sub)tree to visit, or NO_NODE
+
+    Yields:
+        the indices of the nodes
+    """
+    left_children = tree._left_children
+    right_children = tree._right_children
+
+    stack = array(_INDEX_TYPECODE)
+    current = index
+
+    while current != NO_NODE or stack:
+        while current != NO_NODE:
+            stack.append(current)
+            current = left_children[current]
+
+        current = stack.pop()
+        yield current
+        current = right_children[current]
+
+
+def iter_pre_order(tree: ArrayTree[K, V], index: int) -> Iterator[int]:
+    """Lazily visit a tree using pre-order strategy.
+
+    Args:
+        tree: the tree to visit
+        index: the index of the root of the (sub)tree to visit, or NO_NODE
+
+    Yields:
+        the indices of the nodes
+    """
+    if index == NO_NODE:
+        return
+
+    left_children = tree._left_children
+    right_children = tree._right_children
+
+    stack = array(_INDEX_TYPECODE, [index])
+    while stack:
+        current = stack.pop()
+        yield current
+
+        if right_children[current] != NO_NODE:
+            stack.append(right_children[current])
+        if left_children[current] != NO_NODE:
+            stack.append(left_children[current])
+
+
+def iter_post_order(tree: ArrayTree[K, V], index: int) -> Iterator[int]:
+    """Lazily visit a tree using post-order strategy.
+
+    Args:
+        tree: the tree to visit
+        index: the index of the root of the (sub)tree to visit, or NO_NODE
+
+    Yields:
+        the indices of the nodes
+    """
+    left_children = tree._left_children
+    right_children = tree._right_children
+
+    stack = array(_INDEX_TYPECODE)
+    current = index
+    last_visited = NO_NODE
+
+    while current != NO_NODE or stack:
+        while current != NO_NODE:
+            stack.append(current)
+            current = left_children[current]
+
+        top = stack[-1]
+        right_child = right_children[top]
+        if right_child != NO_NODE and right_child != last_visited:
+            current = right_child
+        else:
+            last_visited = stack.pop()
+            yield last_visited
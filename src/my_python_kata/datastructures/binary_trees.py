@@ -5,6 +5,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Callable
 from typing import Generic
+from typing import Iterator
+from typing import Sequence
 from typing import TypeVar
 
 
@@ -59,6 +61,9 @@ class Node(Generic[K, V]):
 # Alias for better readability
 ActionCallback = Callable[[Node[K, V]], bool]
 
+# Function creating a new node from a key and its value
+NodeFactory = Callable[[K, V], Node[K, V]]
+
 
 def visit_in_order(
     node: Node[K, V] | None, on_node_action: ActionCallback[K, V]
@@ -67,14 +72,8 @@ def visit_in_order(
 
     See https://en.wikipedia.org/wiki/Tree_traversal.
     """
-    if not node:
-        return
-
-    visit_in_order(node.left_child, on_node_action)
-
-    on_node_action(node)
-
-    visit_in_order(node.right_child, on_node_action)
+    for visited_node in iter_in_order(node):
+        on_node_action(visited_node)
 
 
 def visit_pre_order(
@@ -84,14 +83,8 @@ def visit_pre_order(
 
     See https://en.wikipedia.org/wiki/Tree_traversal.
     """
-    if not node:
-        return
-
-    on_node_action(node)
-
-    visit_pre_order(node.left_child, on_node_action)
-
-    visit_pre_order(node.right_child, on_node_action)
+    for visited_node in iter_pre_order(node):
+        on_node_action(visited_node)
 
 
 def visit_post_order(
@@ -101,14 +94,149 @@ def visit_post_order(
 
     See https://en.wikipedia.org/wiki/Tree_traversal.
     """
+    for visited_node in iter_post_order(node):
+        on_node_action(visited_node)
+
+
+def iter_in_order(node: Node[K, V] | None) -> Iterator[Node[K, V]]:
+    """Lazily visit a tree using in-order strategy.
+
+    Traversals use an explicit stack instead of recursion, so they work on
+    trees of any depth, and they can be stopped at any time.
+
+    Args:
+        node: the root of the tree
+
+    Yields:
+        the nodes of the tree
+    """
+    stack: list[Node[K, V]] = []
+    current = node
+
+    while current or stack:
+        # Go down to the leftmost node, then visit it and its right subtree
+        while current:
+            stack.append(current)
+            current = current.left_child
+
+        current = stack.pop()
+        yield current
+        current = current.right_child
+
+
+def iter_pre_order(node: Node[K, V] | None) -> Iterator[Node[K, V]]:
+    """Lazily visit a tree using pre-order strategy.
+
+    Args:
+        node: the root of the tree
+
+    Yields:
+        the nodes of the tree
+    """
     if not node:
         return
 
-    visit_post_order(node.left_child, on_node_action)
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        yield current
+
+        # Right child is pushed first, so the left one is visited first
+        if current.right_child:
+            stack.append(current.right_child)
+        if current.left_child:
+            stack.append(current.left_child)
+
+
+def iter_post_order(node: Node[K, V] | None) -> Iterator[Node[K, V]]:
+    """Lazily visit a tree using post-order strategy.
+
+    Args:
+        node: the root of the tree
+
+    Yields:
+        the nodes of the tree
+    """
+    stack: list[Node[K, V]] = []
+    current = node
+    last_visited: Node[K, V] | None = None
+
+    while current or stack:
+        while current:
+            stack.append(current)
+            current = current.left_child
+
+        top = stack[-1]
+        if top.right_child and top.right_child is not last_visited:
+            # The right subtree must be visited before its parent
+            current = top.right_child
+        else:
+            last_visited = stack.pop()
+            yield last_visited
+
+
+def build_balanced(
+    sorted_items: Sequence[tuple[K, V]],
+    node_factory: NodeFactory[K, V] = Node,
+) -> Node[K, V] | None:
+    """Build a balanced binary search tree from (key, value) pairs.
+
+    The middle pair of every range becomes the root of its subtree, so the
+    sizes of the two subtrees of every node differ at most by one. The tree
+    is built in O(n), with an explicit stack instead of recursion.
+
+    Args:
+        sorted_items: the (key, value) pairs, sorted by key with no duplicates
+        node_factory: the function creating the nodes (default: Node).
+            Children are attached after the node is created.
+
+    Returns:
+        the root of the tree, or None if there are no pairs
+    """
+    root: Node[K, V] | None = None
+
+    # Ranges of pairs still to be built, with the parent their subtree must
+    # be attached to and on which side
+    stack: list[tuple[int, int, Node[K, V] | None, bool]] = [
+        (0, len(sorted_items), None, False)
+    ]
+    while stack:
+        start, end, parent, is_left_child = stack.pop()
+        if start >= end:
+            continue
+
+        middle = (start + end) // 2
+        key, value = sorted_items[middle]
+        node = node_factory(key, value)
+
+        if parent is None:
+            root = node
+        elif is_left_child:
+            parent.left_child = node
+        else:
+            parent.right_child = node
+
+        stack.append((start, middle, node, True))
+        stack.append((middle + 1, end, node, False))
 
-    visit_post_order(node.right_child, on_node_action)
+    return root
 
-    on_node_action(node)
+
+def to_sorted_list(node: Node[K, V] | None) -> list[tuple[K, V | None]]:
+    """Returns the (key, value) pairs of a binary search tree, sorted by key.
+
+    This is the inverse of build_balanced(), using an iterative in-order
+    visit.
+
+    Args:
+        node: the root of the tree
+
+    Returns:
+        the (key, value) pairs of the tree
+    """
+    return [
+        (visited_node.key, visited_node.value) for visited_node in iter_in_order(node)
+    ]
 
 
 def is_empty(tree: Node[K, V] | None) -> bool:
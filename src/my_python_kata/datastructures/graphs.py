@@ -1,9 +1,12 @@
 """Graph module implemented using adjacency lists."""
 
+from __future__ import annotations
+
+from array import array
 from collections import defaultdict
-from dataclasses import dataclass
 from typing import Generic
-from typing import Optional
+from typing import Iterable
+from typing import NamedTuple
 from typing import TypeVar
 from typing import cast
 
@@ -15,9 +18,12 @@ T = TypeVar("T")
 DEFAULT_EDGE_WEIGHT = 1.0
 
 
-@dataclass(eq=True, frozen=True)
-class Edge(Generic[K]):
-    """An edge connects two different nodes."""
+class Edge(NamedTuple, Generic[K]):
+    """An edge connects two different nodes.
+
+    Edges are tuples, so an edge is equal to (and has the same hash as) the
+    plain (source, target) tuple.
+    """
 
     source: K
     target: K
@@ -29,11 +35,16 @@ class Graph(Generic[K, T]):
     Implementation notes:
      * it uses adjacency lists (a dict of lists) for storing nodes and their
        connected nodes.
-     * it favors runtime performannce at the expense of build time performance
-       e.g., we use lists for storing nodes even if checking that there are no
-       duplicates nodes at build time is more expensive that using a set.
-       Using a list is more efficient when traversing the graph instead of
-       using a set (you usually iterate on all connected nodes anyway).
+     * it favors runtime performannce: we use lists for storing connected
+       nodes since they are more efficient than sets when traversing the graph
+       (you usually iterate on all connected nodes anyway).
+     * duplicate edges are detected using the edge weights index (a dict keyed
+       by plain (source, target) tuples, cheaper to build and hash than Edge
+       instances), so connecting nodes is O(1) amortized, regardless of the
+       node degree.
+     * a reverse adjacency index (incoming nodes) is maintained while
+       connecting nodes, so that directed graphs can also be traversed
+       backwards.
 
     Note that the generic type K must respect the Comparable contract and support
     <, >, and == operators.
@@ -41,13 +52,16 @@ class Graph(Generic[K, T]):
 
     _nodes: dict[K, list[K]]
 
+    _reverse_nodes: dict[K, list[K]]
+
     _nodes_data: dict[K, T]
 
-    _edges_weight: dict[Edge[K], float]
+    _edges_weight: dict[tuple[K, K], float]
 
     def __init__(self) -> None:
         """Construct a new empty graph."""
         self._nodes = defaultdict(list)
+        self._reverse_nodes = defaultdict(list)
         self._nodes_data = dict()
         self._edges_weight = dict()
 
@@ -77,12 +91,48 @@ class Graph(Generic[K, T]):
 
     def _connect(self, source_node: K, target_node: K, weight: float) -> None:
         connected_nodes = self._nodes[source_node]
-        if target_node not in connected_nodes:
+        edge = (source_node, target_node)
+        if edge not in self._edges_weight:
             self.add_node(target_node)
 
             connected_nodes.append(target_node)
+            self._reverse_nodes[target_node].append(source_node)
+
+            self._edges_weight[edge] = weight
+
+    def add_edges(
+        self, edges: Iterable[tuple[K, K, float]], bidirectional: bool = True
+    ) -> None:
+        """Connect nodes in bulk, from an iterable of (source, target, weight).
+
+        This is equivalent to calling connect() for every edge but it avoids
+        the per-edge method calls, so prefer it when building large graphs.
 
-            self._edges_weight[Edge(source_node, target_node)] = weight
+        Args:
+            edges: an iterable of (source_node, target_node, weight) tuples
+            bidirectional: a flag that indicates if the arcs are going to be
+                bidirectional (default: True)
+        """
+        nodes = self._nodes
+        reverse_nodes = self._reverse_nodes
+        edges_weight = self._edges_weight
+
+        for source_node, target_node, weight in edges:
+            connected_nodes = nodes[source_node]
+            edge = (source_node, target_node)
+            if edge not in edges_weight:
+                if target_node not in nodes:
+                    nodes[target_node] = []
+                connected_nodes.append(target_node)
+                reverse_nodes[target_node].append(source_node)
+                edges_weight[edge] = weight
+
+            if bidirectional:
+                edge = (target_node, source_node)
+                if edge not in edges_weight:
+                    nodes[target_node].append(source_node)
+                    reverse_nodes[source_node].append(target_node)
+                    edges_weight[edge] = weight
 
     def is_edge_present(self, source_node: K, target_node: K) -> bool:
         """Checks if two nodes are connected, assuming a directional connection.
@@ -97,12 +147,28 @@ class Graph(Generic[K, T]):
             True if there is a connection from source_node to target_node,
                 False otherwise
         """
-        return Edge[K](source_node, target_node) in self._edges_weight
+        return (source_node, target_node) in self._edges_weight
+
+    def get_edge_weight(self, source_node: K, target_node: K) -> float | None:
+        """Returns the weight of the edge "source_node --> target_node".
+
+        Args:
+            source_node: the source node
+            target_node: the target node
+
+        Returns:
+            the weight of the edge, or None if there is no such edge
+        """
+        return self._edges_weight.get((source_node, target_node), None)
 
     def size(self) -> int:
         """Returns the amount of nodes within this graph."""
         return len(self._nodes)
 
+    def get_nodes(self) -> list[K]:
+        """Returns all the nodes of this graph, in insertion order."""
+        return list(self._nodes)
+
     def get_connected_nodes(self, node: K) -> list[K]:
         """Returns a list of nodes if a connecting arc with this node exists.
 
@@ -111,6 +177,15 @@ class Graph(Generic[K, T]):
         """
         return self._nodes[node] if self.contains(node) else []
 
+    def get_incoming_nodes(self, node: K) -> list[K]:
+        """Returns a list of nodes if a connecting arc towards this node exists.
+
+        This is the reverse of get_connected_nodes(): for directed graphs, it
+        returns the nodes "n" for which there is a "n --> node" edge.
+        Result may be empty if there are no such nodes or there is no such node.
+        """
+        return self._reverse_nodes.get(node, [])
+
     def contains(self, node: K) -> bool:
         """Check if the specified node is present in this graph.
 
@@ -133,7 +208,7 @@ class Graph(Generic[K, T]):
         if node not in self._nodes:
             self._nodes[node] = list()
 
-    def get_data(self, key: K) -> Optional[T]:
+    def get_data(self, key: K) -> T | None:
         """Returns the value associated to the key, if present.
 
         Args:
@@ -145,7 +220,7 @@ class Graph(Generic[K, T]):
         """
         return self._nodes_data.get(key, None)
 
-    def set_data(self, key: K, data: Optional[T]) -> None:
+    def set_data(self, key: K, data: T | None) -> None:
         """Sets the data for a given node.
 
         If data is None, than any pre-existing data is removed.
@@ -159,6 +234,247 @@ class Graph(Generic[K, T]):
         elif key in self._nodes_data:
             del self._nodes_data[key]
 
+    def freeze(self) -> FrozenGraph[K, T]:
+        """Returns an immutable, compact snapshot of this graph.
+
+        Later changes to this graph will not be reflected in the snapshot.
+        """
+        return FrozenGraph.from_graph(self)
+
+
+class FrozenGraph(Generic[K, T]):
+    """An immutable snapshot of a graph, optimized for read-heavy traversals.
+
+    Implementation notes:
+     * it uses the compressed sparse row (CSR) layout: nodes are interned into
+       dense integer ids (following the insertion order of the source graph)
+       and the connected nodes of node "i" are stored into
+       targets[offsets[i]:offsets[i + 1]], with their weights in the same
+       positions of the weights array.
+     * offsets, targets and weights are typed arrays, so there is no per-edge
+       Python object and no hashing when iterating on connected nodes.
+     * algorithms can work directly with the integer ids, using
+       get_node_id(), get_node() and get_connected_ids().
+     * incoming edges are stored using the same layout in the reverse
+       offsets/targets arrays.
+    """
+
+    _node_keys: list[K]
+
+    _node_ids: dict[K, int]
+
+    _offsets: array[int]
+
+    _targets: array[int]
+
+    _weights: array[float]
+
+    _reverse_offsets: array[int]
+
+    _reverse_targets: array[int]
+
+    _nodes_data: dict[K, T]
+
+    def __init__(
+        self,
+        node_keys: list[K],
+        offsets: array[int],
+        targets: array[int],
+        weights: array[float],
+        reverse_offsets: array[int],
+        reverse_targets: array[int],
+        nodes_data: dict[K, T],
+    ) -> None:
+        """Construct a new frozen graph from its CSR arrays.
+
+        Use FrozenGraph.from_graph() or Graph.freeze() instead of calling this
+        constructor directly.
+
+        Args:
+            node_keys: the node keys, indexed by their node id
+            offsets: the start offset of every node in targets (plus a final
+                sentinel equal to the number of edges)
+            targets: the target node ids of all edges
+            weights: the weights of all edges
+            reverse_offsets: the start offset of every node in reverse_targets
+                (plus a final sentinel equal to the number of edges)
+            reverse_targets: the source node ids of all edges, grouped by
+                their target node
+            nodes_data: the data associated to the nodes
+        """
+        self._node_keys = node_keys
+        self._node_ids = {key: node_id for node_id, key in enumerate(node_keys)}
+        self._offsets = offsets
+        self._targets = targets
+        self._weights = weights
+        self._reverse_offsets = reverse_offsets
+        self._reverse_targets = reverse_targets
+        self._nodes_data = nodes_data
+
+    @classmethod
+    def from_graph(cls, graph: Graph[K, T]) -> FrozenGraph[K, T]:
+        """Factory for creating a frozen snapshot of the given graph.
+
+        Args:
+            graph: the graph to freeze
+
+        Returns:
+            the frozen graph
+        """
+        node_keys = list(graph._nodes)
+        node_ids = {key: node_id for node_id, key in enumerate(node_keys)}
+        edges_weight = graph._edges_weight
+
+        offsets = array("q", [0])
+        targets = array("i")
+        weights = array("d")
+        reverse_offsets = array("q", [0])
+        reverse_targets = array("i")
+
+        for source_node in node_keys:
+            connected_nodes = graph._nodes[source_node]
+
+            targets.extend([node_ids[node] for node in connected_nodes])
+            weights.extend(
+                [edges_weight[source_node, node] for node in connected_nodes]
+            )
+            offsets.append(len(targets))
+
+            incoming_nodes = graph.get_incoming_nodes(source_node)
+
+            reverse_targets.extend([node_ids[node] for node in incoming_nodes])
+            reverse_offsets.append(len(reverse_targets))
+
+        return cls(
+            node_keys,
+            offsets,
+            targets,
+            weights,
+            reverse_offsets,
+            reverse_targets,
+            dict(graph._nodes_data),
+        )
+
+    def size(self) -> int:
+        """Returns the amount of nodes within this graph."""
+        return len(self._node_keys)
+
+    def contains(self, node: K) -> bool:
+        """Check if the specified node is present in this graph.
+
+        Args:
+            node: the node to check for presence.
+
+        Returns:
+            True if the node is present, False otherwise
+        """
+        return node in self._node_ids
+
+    def get_nodes(self) -> list[K]:
+        """Returns all the nodes of this graph, ordered by node id."""
+        return list(self._node_keys)
+
+    def get_node_id(self, node: K) -> int | None:
+        """Returns the dense integer id of a node, or None if not present."""
+        return self._node_ids.get(node, None)
+
+    def get_node(self, node_id: int) -> K:
+        """Returns the node key for the given node id."""
+        return self._node_keys[node_id]
+
+    def get_connected_ids(self, node_id: int) -> array[int]:
+        """Returns the ids of the nodes connected to the given node id."""
+        return self._targets[self._offsets[node_id] : self._offsets[node_id + 1]]
+
+    def get_connected_weights(self, node_id: int) -> array[float]:
+        """Returns the edge weights, in the same order of get_connected_ids()."""
+        return self._weights[self._offsets[node_id] : self._offsets[node_id + 1]]
+
+    def get_connected_nodes(self, node: K) -> list[K]:
+        """Returns a list of nodes if a connecting arc with this node exists.
+
+        Result may be empty if there are no connected nodes (e.g., leaf or
+        disjointed node) or there is no such node.
+        """
+        node_id = self._node_ids.get(node, None)
+        if node_id is None:
+            return []
+
+        node_keys = self._node_keys
+        return [node_keys[target] for target in self.get_connected_ids(node_id)]
+
+    def get_incoming_ids(self, node_id: int) -> array[int]:
+        """Returns the ids of the nodes having an edge towards the given node id."""
+        return self._reverse_targets[
+            self._reverse_offsets[node_id] : self._reverse_offsets[node_id + 1]
+        ]
+
+    def get_incoming_nodes(self, node: K) -> list[K]:
+        """Returns a list of nodes if a connecting arc towards this node exists.
+
+        Result may be empty if there are no such nodes or there is no such node.
+        """
+        node_id = self._node_ids.get(node, None)
+        if node_id is None:
+            return []
+
+        node_keys = self._node_keys
+        return [node_keys[source] for source in self.get_incoming_ids(node_id)]
+
+    def is_edge_present(self, source_node: K, target_node: K) -> bool:
+        """Checks if two nodes are connected, assuming a directional connection.
+
+        This function will check if "source_node --> target_node" only.
+
+        Args:
+            source_node: the source node :)
+            target_node: the target node
+
+        Returns:
+            True if there is a connection from source_node to target_node,
+                False otherwise
+        """
+        source_id = self._node_ids.get(source_node, None)
+        target_id = self._node_ids.get(target_node, None)
+        if source_id is None or target_id is None:
+            return False
+
+        return target_id in self.get_connected_ids(source_id)
+
+    def get_edge_weight(self, source_node: K, target_node: K) -> float | None:
+        """Returns the weight of the edge "source_node --> target_node".
+
+        Args:
+            source_node: the source node
+            target_node: the target node
+
+        Returns:
+            the weight of the edge, or None if there is no such edge
+        """
+        source_id = self._node_ids.get(source_node, None)
+        target_id = self._node_ids.get(target_node, None)
+        if source_id is None or target_id is None:
+            return None
+
+        connected_ids = self.get_connected_ids(source_id)
+        if target_id not in connected_ids:
+            return None
+
+        edge_offset = self._offsets[source_id] + connected_ids.index(target_id)
+        return self._weights[edge_offset]
+
+    def get_data(self, key: K) -> T | None:
+        """Returns the value associated to the key, if present.
+
+        Args:
+            key: the node key
+
+        Returns:
+            the value if present, or None if the node is not present or
+            no value was assigned to it.
+        """
+        return self._nodes_data.get(key, None)
+
 
 # Disabled MyPy check because of
 # https://github.com/python/mypy/issues/1178
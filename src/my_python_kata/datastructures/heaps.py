@@ -1,40 +1,75 @@
 """Heap data-structures."""
 
-import logging
+import operator
+from typing import Any
+from typing import Callable
+from typing import Dict
 from typing import Generic
+from typing import Hashable
+from typing import Iterable
 from typing import List
 from typing import Optional
 from typing import TypeVar
-from typing import cast
 
 
 # Generic data type per items in a data page
 T = TypeVar("T")
 
+# Generic type for the keys of addressable heaps
+H = TypeVar("H", bound=Hashable)
 
-class MaxHeap(Generic[T]):
-    """A Max heap is a binary tree that enforce Max heap property.
+# Function extracting the comparison key from an item
+KeyFunction = Callable[[T], Any]
 
-    This means that the root element is always bigger that his children,
-    for any given subtree.
 
-    Insertion and extraction are performed in O(lg2 n).
+class Heap(Generic[T]):
+    """A heap is a binary tree that enforces the heap property.
+
+    This means that the root element always comes before its children, for
+    any given subtree: by default the heap is a Min heap (the root element is
+    the smallest one), while with reverse=True it is a Max heap.
+
+    Insertion and extraction are performed in O(lg2 n), while building a heap
+    from an initial list of elements is performed in O(n).
+
+    Implementation notes:
+     * items are compared by their key, which is computed only once per item
+       (when it is added to the heap) and stored in a list parallel to the
+       items list, so comparisons never call the key function.
+     * items are never tested for truthiness, so items like 0, "" or False
+       are fully supported.
 
     References:
     * https://www.programiz.com/dsa/heap-data-structure
     """
 
-    _data: List[T] = []
+    _data: List[T]
+
+    _keys: List[Any]
 
-    def __init__(self, data: List[T]) -> None:
+    def __init__(
+        self,
+        data: Optional[List[T]] = None,
+        key: Optional[KeyFunction[T]] = None,
+        reverse: bool = False,
+    ) -> None:
         """Construct a new heap from the initial list of elements.
 
         Args:
-            data: the list of initial elements for the heap.
-
+            data: the list of initial elements for the heap (optional).
+            key: a function extracting the comparison key from an item
+                (default: items are compared directly)
+            reverse: if True, the biggest item is at the root (default: False)
         """
-        self._data = data.copy()
-        self._heapify(0)
+        self._key = key
+        # Tells if the first key must stay above the second one in the heap
+        self._is_above: Callable[[Any, Any], bool] = (
+            operator.gt if reverse else operator.lt
+        )
+
+        self._data = list(data) if data else []
+        self._keys = self._compute_keys(self._data)
+        self._build()
 
     def insert(self, item: T) -> None:
         """Insert a new iterm in the heap.
@@ -43,23 +78,73 @@ class MaxHeap(Generic[T]):
             item: the item to add
         """
         self._data.append(item)
+        self._keys.append(self._key(item) if self._key else item)
         self._bubble_top(self.size() - 1)
 
-    def max(self) -> Optional[T]:
-        """Returns the current max item or None if the heap is empty."""
-        return self._get_value_at(0)
+    def insert_many(self, items: Iterable[T]) -> None:
+        """Insert many items in the heap.
+
+        When the number of new items is large compared to the heap size, the
+        heap is rebuilt in O(n) instead of inserting items one at a time in
+        O(k lg2 n).
+
+        Args:
+            items: the items to add
+        """
+        new_items = list(items)
+
+        old_size = self.size()
+        self._data.extend(new_items)
+        self._keys.extend(self._compute_keys(new_items))
+
+        new_size = self.size()
+        added_items = new_size - old_size
+
+        if added_items * new_size.bit_length() > new_size:
+            self._build()
+        else:
+            for i in range(old_size, new_size):
+                self._bubble_top(i)
+
+    def top(self) -> Optional[T]:
+        """Returns the current root item or None if the heap is empty."""
+        return self._data[0] if self._data else None
 
     def extract(self) -> Optional[T]:
-        """Returns the current max item and removes it from the heap.
+        """Returns the current root item and removes it from the heap.
 
         It will return None is the ehap is empty.
         """
         if self.size() == 0:
             return None
 
-        root_value = self._remove_item_at_index(0)
+        return self._remove_item_at_index(0)
 
-        return root_value
+    def extract_many(self, k: int) -> List[T]:
+        """Returns the first k items and removes them from the heap.
+
+        Args:
+            k: the number of items to extract
+
+        Returns:
+            the extracted items, in heap order. There may be less than k items
+            if the heap does not contain enough items.
+        """
+        data = self._data
+        keys = self._keys
+        extracted_items: List[T] = []
+
+        for _ in range(min(k, len(data))):
+            extracted_items.append(data[0])
+
+            last_item = data.pop()
+            last_key = keys.pop()
+            if data:
+                data[0] = last_item
+                keys[0] = last_key
+                self._bubble_down(0)
+
+        return extracted_items
 
     def remove(self, item: T) -> Optional[T]:
         """Removes the specified item from the heap.
@@ -73,80 +158,398 @@ class MaxHeap(Generic[T]):
         Returns:
             the removed item or None if no such item was found
         """
-        if not item:
+        # O(n) in the array
+        try:
+            item_index = self._data.index(item)
+        except ValueError:
             return None
 
+        return self._remove_item_at_index(item_index)
+
+    def size(self) -> int:
+        """Returns the number of items in this heap."""
+        return len(self._data)
+
+    def _compute_keys(self, items: List[T]) -> List[Any]:
+        return list(map(self._key, items)) if self._key else list(items)
+
+    def _remove_item_at_index(self, item_index: int) -> T:
+        # replace the item to be removed with the last one, shrinking the
+        # array in place, and then restore the heap property for the moved
+        # item, which may need to go either down or up
+        item = self._data[item_index]
+
+        last_item = self._data.pop()
+        last_key = self._keys.pop()
+
+        if item_index < self.size():
+            self._data[item_index] = last_item
+            self._keys[item_index] = last_key
+            self._bubble_down(item_index)
+            self._bubble_top(item_index)
+
+        return item
+
+    def _build(self) -> None:
+        # Floyd's bottom-up construction: leaves are already valid heaps, so we
+        # only need to bubble down the inner nodes, from the last one to the root
+        for i in range(self.size() // 2 - 1, -1, -1):
+            self._bubble_down(i)
+
+    def _bubble_down(self, i: int) -> None:
+        # Move the item down, swapping it with its first child, until no child
+        # should stay above it.
+        # Instead of swapping at every level, children are moved up and the
+        # item is written only once, in its final position.
+        data = self._data
+        keys = self._keys
+        is_above = self._is_above
+        size = len(data)
+
+        item = data[i]
+        key = keys[i]
+
+        child_index = 2 * i + 1
+        while child_index < size:
+            right_index = child_index + 1
+            if right_index < size and is_above(keys[right_index], keys[child_index]):
+                child_index = right_index
+
+            if not is_above(keys[child_index], key):
+                break
+
+            data[i] = data[child_index]
+            keys[i] = keys[child_index]
+            i = child_index
+            child_index = 2 * i + 1
+
+        data[i] = item
+        keys[i] = key
+
+    def _bubble_top(self, i: int) -> None:
+        # Move the item up, until its root should stay above it
+        data = self._data
+        keys = self._keys
+        is_above = self._is_above
+
+        item = data[i]
+        key = keys[i]
+
+        while i > 0:
+            root_index = (i - 1) // 2
+            if not is_above(key, keys[root_index]):
+                # No need to examine other elements up to the root,
+                # the heap condition is alread in place
+                break
+
+            data[i] = data[root_index]
+            keys[i] = keys[root_index]
+            i = root_index
+
+        data[i] = item
+        keys[i] = key
+
+
+class MaxHeap(Heap[T]):
+    """A Max heap is a binary tree that enforce Max heap property.
+
+    This means that the root element is always bigger that his children,
+    for any given subtree.
+    """
+
+    def __init__(
+        self, data: Optional[List[T]] = None, key: Optional[KeyFunction[T]] = None
+    ) -> None:
+        """Construct a new heap from the initial list of elements.
+
+        Args:
+            data: the list of initial elements for the heap (optional).
+            key: a function extracting the comparison key from an item
+                (default: items are compared directly)
+        """
+        super().__init__(data, key, reverse=True)
+
+    def max(self) -> Optional[T]:
+        """Returns the current max item or None if the heap is empty."""
+        return self.top()
+
+
+class MinHeap(Heap[T]):
+    """A Min heap is a binary tree that enforce Min heap property.
+
+    This means that the root element is always smaller that his children,
+    for any given subtree.
+    """
+
+    def __init__(
+        self, data: Optional[List[T]] = None, key: Optional[KeyFunction[T]] = None
+    ) -> None:
+        """Construct a new heap from the initial list of elements.
+
+        Args:
+            data: the list of initial elements for the heap (optional).
+            key: a function extracting the comparison key from an item
+                (default: items are compared directly)
+        """
+        super().__init__(data, key, reverse=False)
+
+    def min(self) -> Optional[T]:
+        """Returns the current min item or None if the heap is empty."""
+        return self.top()
+
+
+class IndexedHeap(Generic[H, T]):
+    """A heap of (key, priority) pairs, addressable by key.
+
+    By default the root pair has the smallest priority, while with
+    reverse=True it has the biggest one. Differently from Heap, the heap
+    tracks the position of every key so that:
+    * contains() and get_priority() are performed in O(1)
+    * remove() and update() are performed in O(lg2 n)
+
+    Implementation notes:
+     * keys and priorities are stored in two parallel lists, while a dict maps
+       every key to its current position in the lists.
+     * keys are unique: inserting a key already present updates its priority.
+    """
+
+    _keys: List[H]
+
+    _priorities: List[T]
+
+    _positions: Dict[H, int]
+
+    def __init__(
+        self, items: Optional[Iterable[tuple[H, T]]] = None, reverse: bool = False
+    ) -> None:
+        """Construct a new heap from the initial (key, priority) pairs.
+
+        Args:
+            items: the initial (key, priority) pairs for the heap (optional).
+                For duplicate keys, the last priority wins.
+            reverse: if True, the biggest priority is at the root
+                (default: False)
+        """
+        self._is_above: Callable[[Any, Any], bool] = (
+            operator.gt if reverse else operator.lt
+        )
+
+        self._keys = []
+        self._priorities = []
+        self._positions = {}
+
+        for key, priority in items or []:
+            position = self._positions.get(key, None)
+            if position is None:
+                self._positions[key] = len(self._keys)
+                self._keys.append(key)
+                self._priorities.append(priority)
+            else:
+                self._priorities[position] = priority
+
+        # Floyd's bottom-up construction, as in Heap
+        for i in range(self.size() // 2 - 1, -1, -1):
+            self._bubble_down(i)
+
+    def insert(self, key: H, priority: T) -> None:
+        """Insert a new key in the heap, or update its priority if present.
+
+        Args:
+            key: the key to add
+            priority: the priority of the key
+        """
+        if key in self._positions:
+            self.update(key, priority)
+            return
+
+        self._positions[key] = self.size()
+        self._keys.append(key)
+        self._priorities.append(priority)
+
+        self._bubble_top(self.size() - 1)
+
+    def update(self, key: H, priority: T) -> bool:
+        """Change the priority of a key.
+
+        Args:
+            key: the key to update
+            priority: the new priority
+
+        Returns:
+            True if the key was updated, False if there is no such key
+        """
+        position = self._positions.get(key, None)
+        if position is None:
+            return False
+
+        self._priorities[position] = priority
+
+        self._bubble_down(position)
+        self._bubble_top(self._positions[key])
+
+        return True
+
+    def contains(self, key: H) -> bool:
+        """Checks if the key is present in the heap."""
+        return key in self._positions
+
+    def get_priority(self, key: H) -> Optional[T]:
+        """Returns the priority of a key, or None if there is no such key."""
+        position = self._positions.get(key, None)
+        return self._priorities[position] if position is not None else None
+
+    def top(self) -> Optional[tuple[H, T]]:
+        """Returns the (key, priority) pair at the root of the heap.
+
+        It will return None if the heap is empty.
+        """
         if self.size() == 0:
             return None
-        # O(n) in the array
-        item_index = self._data.index(item)
 
-        return self._remove_item_at_index(item_index)
+        return self._keys[0], self._priorities[0]
+
+    def extract(self) -> Optional[tuple[H, T]]:
+        """Returns the (key, priority) pair at the root of the heap.
+
+        The pair is removed from the heap. It will return None if the heap is
+        empty.
+        """
+        if self.size() == 0:
+            return None
 
-    def _remove_item_at_index(self, item_index: int) -> Optional[T]:
-        # swap the item to be removed with the last one, resize the array
-        # and then heapify the sub-heap
-        item = self._get_value_at(item_index)
+        key = self._keys[0]
+        return key, self._remove_item_at_index(0)
 
-        self._swap(item_index, self.size() - 1)
+    def remove(self, key: H) -> Optional[T]:
+        """Removes the specified key from the heap.
 
-        self._data = self._data[:-1]
+        Args:
+            key: the key to remove
 
-        self._heapify(item_index)
+        Returns:
+            the priority of the removed key or None if no such key was found
+        """
+        position = self._positions.get(key, None)
+        if position is None:
+            return None
 
-        return item
+        return self._remove_item_at_index(position)
 
     def size(self) -> int:
-        """Returns the number of items in this heap."""
-        return len(self._data)
+        """Returns the number of keys in this heap."""
+        return len(self._keys)
 
-    def _heapify(self, this_node_index: int) -> None:
-        this_node_value = self._get_value_at(this_node_index)
-        if not this_node_value:
-            return
+    def _remove_item_at_index(self, item_index: int) -> T:
+        # same approach of Heap, also keeping track of positions
+        keys = self._keys
+        priorities = self._priorities
+
+        priority = priorities[item_index]
+        del self._positions[keys[item_index]]
+
+        last_key = keys.pop()
+        last_priority = priorities.pop()
+
+        if item_index < self.size():
+            keys[item_index] = last_key
+            priorities[item_index] = last_priority
+            self._positions[last_key] = item_index
+
+            self._bubble_down(item_index)
+            self._bubble_top(self._positions[last_key])
 
-        left_index = 2 * this_node_index + 1
-        right_index = 2 * this_node_index + 2
+        return priority
 
-        logging.info(f"_heapify({this_node_index}, {left_index}, {right_index}")
+    def _bubble_down(self, i: int) -> None:
+        keys = self._keys
+        priorities = self._priorities
+        positions = self._positions
+        is_above = self._is_above
+        size = len(keys)
 
-        left_value = self._get_value_at(left_index)
-        right_value = self._get_value_at(right_index)
+        key = keys[i]
+        priority = priorities[i]
 
-        if left_value:
-            if this_node_value < left_value:  # type: ignore
-                self._swap(this_node_index, left_index)
-            self._heapify(left_index)
+        child_index = 2 * i + 1
+        while child_index < size:
+            right_index = child_index + 1
+            if right_index < size and is_above(
+                priorities[right_index], priorities[child_index]
+            ):
+                child_index = right_index
 
-        if right_value:
-            if this_node_value < right_value:  # type: ignore
-                self._swap(this_node_index, right_index)
-            self._heapify(right_index)
+            if not is_above(priorities[child_index], priority):
+                break
+
+            keys[i] = keys[child_index]
+            priorities[i] = priorities[child_index]
+            positions[keys[i]] = i
+            i = child_index
+            child_index = 2 * i + 1
+
+        keys[i] = key
+        priorities[i] = priority
+        positions[key] = i
 
     def _bubble_top(self, i: int) -> None:
-        # Already at root level, bail out
-        if i == 0:
-            return
+        keys = self._keys
+        priorities = self._priorities
+        positions = self._positions
+        is_above = self._is_above
+
+        key = keys[i]
+        priority = priorities[i]
 
-        swapped = True
-        while i > 0 and swapped:
+        while i > 0:
             root_index = (i - 1) // 2
-            root_value = cast(T, self._get_value_at(root_index))
+            if not is_above(priority, priorities[root_index]):
+                break
 
-            this_value = cast(T, self._get_value_at(i))
+            keys[i] = keys[root_index]
+            priorities[i] = priorities[root_index]
+            positions[keys[i]] = i
+            i = root_index
 
-            if this_value > root_value:  # type: ignore
-                self._swap(i, root_index)
-                i = root_index
-            else:
-                # No need to examine other elements up to the root,
-                # the heap condition is alread in place
-                swapped = False
+        keys[i] = key
+        priorities[i] = priority
+        positions[key] = i
+
+
+class IndexedMaxHeap(IndexedHeap[H, T]):
+    """An indexed heap where the root pair has the biggest priority."""
 
-    def _swap(self, i: int, j: int) -> None:
-        tmp = self._data[i]
-        self._data[i] = self._data[j]
-        self._data[j] = tmp
+    def __init__(self, items: Optional[Iterable[tuple[H, T]]] = None) -> None:
+        """Construct a new heap from the initial (key, priority) pairs.
 
-    def _get_value_at(self, i: int) -> Optional[T]:
-        return self._data[i] if i >= 0 and i < self.size() else None
+        Args:
+            items: the initial (key, priority) pairs for the heap (optional).
+                For duplicate keys, the last priority wins.
+        """
+        super().__init__(items, reverse=True)
+
+    def max(self) -> Optional[tuple[H, T]]:
+        """Returns the (key, priority) pair with the biggest priority.
+
+        It will return None if the heap is empty.
+        """
+        return self.top()
+
+
+class IndexedMinHeap(IndexedHeap[H, T]):
+    """An indexed heap where the root pair has the smallest priority."""
+
+    def __init__(self, items: Optional[Iterable[tuple[H, T]]] = None) -> None:
+        """Construct a new heap from the initial (key, priority) pairs.
+
+        Args:
+            items: the initial (key, priority) pairs for the heap (optional).
+                For duplicate keys, the last priority wins.
+        """
+        super().__init__(items, reverse=False)
+
+    def min(self) -> Optional[tuple[H, T]]:
+        """Returns the (key, priority) pair with the smallest priority.
+
+        It will return None if the heap is empty.
+        """
+        return self.top()
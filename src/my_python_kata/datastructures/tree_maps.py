@@ -0,0 +1,623 @@
+"""Ordered maps, based on balanced binary search trees."""
+
+from __future__ import annotations
+
+from typing import Generic
+from typing import Iterable
+from typing import Iterator
+from typing import Self
+from typing import Sequence
+from typing import cast
+
+from my_python_kata.datastructures.binary_trees import K
+from my_python_kata.datastructures.binary_trees import Node
+from my_python_kata.datastructures.binary_trees import V
+from my_python_kata.datastructures.binary_trees import build_balanced
+from my_python_kata.datastructures.binary_trees import iter_in_order
+from my_python_kata.datastructures.binary_trees import iter_post_order
+
+
+class AvlNode(Node[K, V]):
+    """A node of an AVL tree, which also stores the height of its subtree."""
+
+    __slots__ = ["height"]
+
+    left_child: AvlNode[K, V] | None
+    right_child: AvlNode[K, V] | None
+
+    def __init__(
+        self,
+        key: K,
+        value: V | None = None,
+        left_child: AvlNode[K, V] | None = None,
+        right_child: AvlNode[K, V] | None = None,
+    ) -> None:
+        """Build a new node.
+
+        Args:
+            key: the key for this node
+            value: the value of this node (optional)
+            left_child: the left node (optional)
+            right_child: the right node (optional)
+        """
+        Node.__init__(self, key, value, left_child, right_child)
+        self.height = 1 + max(_height(left_child), _height(right_child))
+
+
+class BaseTreeMap(Generic[K, V]):
+    """Read operations and AVL rebalancing, shared by all tree maps.
+
+    Rebalancing only changes nodes returned by _copy_on_write(), which are
+    the nodes themselves for maps changed in place (see TreeMap) and their
+    copies for persistent maps (see PersistentTreeMap).
+    """
+
+    _root: AvlNode[K, V] | None
+
+    _size: int
+
+    def __init__(self) -> None:
+        """Construct a new empty map."""
+        self._root = None
+        self._size = 0
+
+    @classmethod
+    def from_sorted(cls, sorted_items: Sequence[tuple[K, V]]) -> Self:
+        """Construct a new map from (key, value) pairs already sorted by key.
+
+        This is O(n), while adding the pairs one by one is O(n lg2 n): the
+        tree is built already balanced with binary_trees.build_balanced(),
+        then the data of every node is computed bottom-up.
+
+        Args:
+            sorted_items: the (key, value) pairs, sorted by key with no
+                duplicates
+
+        Returns:
+            the new map
+
+        Raises:
+            ValueError: if the keys are not sorted or not unique
+        """
+        for i in range(1, len(sorted_items)):
+            if not sorted_items[i - 1][0] < sorted_items[i][0]:
+                raise ValueError(f"Keys are not sorted or not unique at position {i}")
+
+        tree_map = cls()
+        root = build_balanced(sorted_items, tree_map._new_node)
+
+        # Children are attached after their parents are created
+        for node in iter_post_order(root):
+            tree_map._update(cast(AvlNode[K, V], node))
+
+        tree_map._root = cast(AvlNode[K, V] | None, root)
+        tree_map._size = len(sorted_items)
+
+        return tree_map
+
+    @property
+    def root(self) -> Node[K, V] | None:
+        """Returns the root node of the tree, or None if the map is empty."""
+        return self._root
+
+    def size(self) -> int:
+        """Returns the number of keys in this map."""
+        return self._size
+
+    def contains(self, key: K) -> bool:
+        """Checks if the key is present in the map."""
+        return self._find(key) is not None
+
+    def get(self, key: K) -> V | None:
+        """Returns the value of a key, or None if there is no such key."""
+        node = self._find(key)
+        return node.value if node is not None else None
+
+    def floor(self, key: K) -> K | None:
+        """Returns the biggest key less than or equal to the given one.
+
+        Args:
+            key: the key to search
+
+        Returns:
+            the floor key, or None if all keys are bigger
+        """
+        floor_key: K | None = None
+        node = self._root
+        while node is not None:
+            if key == node.key:
+                return key
+
+            if node.key < key:
+                floor_key = node.key
+                node = node.right_child
+            else:
+                node = node.left_child
+
+        return floor_key
+
+    def ceiling(self, key: K) -> K | None:
+        """Returns the smallest key greater than or equal to the given one.
+
+        Args:
+            key: the key to search
+
+        Returns:
+            the ceiling key, or None if all keys are smaller
+        """
+        ceiling_key: K | None = None
+        node = self._root
+        while node is not None:
+            if key == node.key:
+                return key
+
+            if key < node.key:
+                ceiling_key = node.key
+                node = node.left_child
+            else:
+                node = node.right_child
+
+        return ceiling_key
+
+    def keys(self) -> Iterator[K]:
+        """Lazily iterate on the keys, in ascending order.
+
+        Yields:
+            the keys of the map
+        """
+        for node in iter_in_order(self._root):
+            yield node.key
+
+    def items(self) -> Iterator[tuple[K, V | None]]:
+        """Lazily iterate on the (key, value) pairs, in ascending key order.
+
+        Yields:
+            the (key, value) pairs of the map
+        """
+        for node in iter_in_order(self._root):
+            yield node.key, node.value
+
+    def iter_range(self, low: K, high: K) -> Iterator[tuple[K, V | None]]:
+        """Lazily iterate on the (key, value) pairs with low <= key <= high.
+
+        Only the nodes along the path to low and the nodes in the range are
+        visited, so the whole iteration is O(lg2 n + k) for k pairs.
+
+        Args:
+            low: the smallest key of the range
+            high: the biggest key of the range
+
+        Yields:
+            the (key, value) pairs in the range, in ascending key order
+        """
+        # In-order visit with an explicit stack, starting from the ceiling of
+        # low: the stack holds the nodes >= low whose right subtree is still
+        # to be visited
+        stack: list[AvlNode[K, V]] = []
+        node = self._root
+        while node is not None:
+            if node.key < low:
+                node = node.right_child
+            else:
+                stack.append(node)
+                node = node.left_child
+
+        while stack:
+            node = stack.pop()
+            if high < node.key:
+                return
+
+            yield node.key, node.value
+
+            node = node.right_child
+            while node is not None:
+                stack.append(node)
+                node = node.left_child
+
+    def _new_node(self, key: K, value: V) -> AvlNode[K, V]:
+        return AvlNode(key, value)
+
+    def _update(self, node: AvlNode[K, V]) -> None:
+        # Recompute the data of a node from its children
+        node.height = 1 + max(_height(node.left_child), _height(node.right_child))
+
+    def _copy_on_write(self, node: AvlNode[K, V]) -> AvlNode[K, V]:
+        # Returns the node to change in place of the given one
+        return node
+
+    def _find(self, key: K) -> AvlNode[K, V] | None:
+        node = self._root
+        while node is not None and key != node.key:
+            node = node.left_child if key < node.key else node.right_child
+
+        return node
+
+    def _rebalance_path(
+        self,
+        path: list[AvlNode[K, V]],
+        key: K,
+        subtree: AvlNode[K, V] | None,
+    ) -> AvlNode[K, V] | None:
+        # Attach the new subtree at the end of the path to the key, then
+        # rebalance every node of the path, bottom-up. Returns the new root.
+        for parent in reversed(path):
+            parent = self._copy_on_write(parent)
+            if key < parent.key:
+                parent.left_child = subtree
+            else:
+                parent.right_child = subtree
+
+            subtree = self._balance(parent)
+
+        return subtree
+
+    def _delete_node(self, key: K) -> tuple[AvlNode[K, V] | None, AvlNode[K, V]] | None:
+        # Remove the node of the key, returns the new root and the removed
+        # node, or None if there is no such key
+        path: list[AvlNode[K, V]] = []
+        node = self._root
+        while node is not None and key != node.key:
+            path.append(node)
+            node = node.left_child if key < node.key else node.right_child
+
+        if node is None:
+            return None
+
+        if node.left_child is None:
+            replacement = node.right_child
+        elif node.right_child is None:
+            replacement = node.left_child
+        else:
+            # The successor (the smallest key of the right subtree) takes the
+            # place of the removed node
+            right_child, successor = self._remove_min(node.right_child)
+            replacement = self._copy_on_write(successor)
+            replacement.left_child = node.left_child
+            replacement.right_child = right_child
+            replacement = self._balance(replacement)
+
+        return self._rebalance_path(path, key, replacement), node
+
+    def _remove_min(
+        self, node: AvlNode[K, V]
+    ) -> tuple[AvlNode[K, V] | None, AvlNode[K, V]]:
+        # Detach the node with the smallest key from the subtree, returns the
+        # new root of the subtree and the detached node
+        path: list[AvlNode[K, V]] = []
+        while node.left_child is not None:
+            path.append(node)
+            node = node.left_child
+
+        subtree = node.right_child
+        for parent in reversed(path):
+            parent = self._copy_on_write(parent)
+            parent.left_child = subtree
+            subtree = self._balance(parent)
+
+        return subtree, node
+
+    def _balance(self, node: AvlNode[K, V]) -> AvlNode[K, V]:
+        # Restore the AVL property on a node whose subtrees are balanced and
+        # differ at most by two levels, returns the new root of the subtree.
+        # The node must be already returned by _copy_on_write().
+        left_child = node.left_child
+        right_child = node.right_child
+        balance = _height(left_child) - _height(right_child)
+
+        if balance > 1 and left_child is not None:
+            if _height(left_child.left_child) < _height(left_child.right_child):
+                node.left_child = self._rotate_left(self._copy_on_write(left_child))
+            return self._rotate_right(node)
+
+        if balance < -1 and right_child is not None:
+            if _height(right_child.right_child) < _height(right_child.left_child):
+                node.right_child = self._rotate_right(self._copy_on_write(right_child))
+            return self._rotate_left(node)
+
+        self._update(node)
+        return node
+
+    def _rotate_left(self, node: AvlNode[K, V]) -> AvlNode[K, V]:
+        # Only called on nodes with a right child
+        pivot = self._copy_on_write(cast(AvlNode[K, V], node.right_child))
+
+        node.right_child = pivot.left_child
+        pivot.left_child = node
+
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rotate_right(self, node: AvlNode[K, V]) -> AvlNode[K, V]:
+        # Only called on nodes with a left child
+        pivot = self._copy_on_write(cast(AvlNode[K, V], node.left_child))
+
+        node.left_child = pivot.right_child
+        pivot.right_child = node
+
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+
+class TreeMap(BaseTreeMap[K, V]):
+    """A map that keeps its keys sorted, implemented as an AVL tree.
+
+    The heights of the two subtrees of every node differ at most by one, so
+    the tree height is at most about 1.44 lg2 n and get(), put(), delete(),
+    floor() and ceiling() are performed in O(lg2 n), whatever the insertion
+    order of the keys.
+
+    Implementation notes:
+     * nodes are the slotted binary_trees.Node, plus the subtree height, so
+       the traversal functions of binary_trees work on the root node.
+     * all operations are iterative: insertion and deletion record the path
+       from the root and rebalance it bottom-up.
+     * subclasses can store more data in the nodes by overriding _new_node()
+       and _update(), which is called bottom-up on every changed node.
+
+    References:
+    * https://en.wikipedia.org/wiki/AVL_tree
+    """
+
+    def __init__(self, items: Iterable[tuple[K, V]] | None = None) -> None:
+        """Construct a new map from the initial (key, value) pairs.
+
+        Args:
+            items: the initial (key, value) pairs for the map (optional).
+                For duplicate keys, the last value wins.
+        """
+        super().__init__()
+
+        for key, value in items or []:
+            self.put(key, value)
+
+    def put(self, key: K, value: V) -> None:
+        """Insert a new key in the map, or update its value if present.
+
+        Args:
+            key: the key to add
+            value: the value of the key
+        """
+        path: list[AvlNode[K, V]] = []
+        node = self._root
+        while node is not None:
+            if key == node.key:
+                node.value = value
+                return
+
+            path.append(node)
+            node = node.left_child if key < node.key else node.right_child
+
+        self._size += 1
+        self._root = self._rebalance_path(path, key, self._new_node(key, value))
+
+    def delete(self, key: K) -> V | None:
+        """Removes the specified key from the map.
+
+        Args:
+            key: the key to remove
+
+        Returns:
+            the value of the removed key or None if no such key was found
+        """
+        deleted = self._delete_node(key)
+        if deleted is None:
+            return None
+
+        self._root, node = deleted
+        self._size -= 1
+
+        return node.value
+
+
+def _height(node: AvlNode[K, V] | None) -> int:
+    return node.height if node is not None else 0
+
+
+class OrderStatisticNode(AvlNode[K, V]):
+    """A node of an AVL tree, which also stores the size of its subtree."""
+
+    __slots__ = ["size"]
+
+    left_child: OrderStatisticNode[K, V] | None
+    right_child: OrderStatisticNode[K, V] | None
+
+    def __init__(
+        self,
+        key: K,
+        value: V | None = None,
+        left_child: OrderStatisticNode[K, V] | None = None,
+        right_child: OrderStatisticNode[K, V] | None = None,
+    ) -> None:
+        """Build a new node.
+
+        Args:
+            key: the key for this node
+            value: the value of this node (optional)
+            left_child: the left node (optional)
+            right_child: the right node (optional)
+        """
+        AvlNode.__init__(self, key, value, left_child, right_child)
+        self.size = 1 + _size(left_child) + _size(right_child)
+
+
+class OrderStatisticTreeMap(TreeMap[K, V]):
+    """A TreeMap that also answers rank and range counting queries.
+
+    Every node stores the number of nodes in its subtree, kept up to date
+    during rebalancing, so rank(), select() and count_range() are performed
+    in O(lg2 n) instead of visiting the keys one by one.
+
+    References:
+    * https://en.wikipedia.org/wiki/Order_statistic_tree
+    """
+
+    def rank(self, key: K) -> int:
+        """Returns the number of keys smaller than the given one.
+
+        Args:
+            key: the key to search (it does not need to be in the map)
+
+        Returns:
+            the rank of the key, i.e. its position if it is in the map
+        """
+        return self._count_smaller(key, False)
+
+    def select(self, i: int) -> K:
+        """Returns the i-th smallest key (starting from 0).
+
+        Args:
+            i: the position of the key, negative values count from the end
+
+        Returns:
+            the key at the given position
+
+        Raises:
+            IndexError: if the position is out of range
+        """
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError(f"Position {i} out of range")
+
+        node = cast(OrderStatisticNode[K, V], self._root)
+        while True:
+            left_size = _size(node.left_child)
+            if i == left_size:
+                return node.key
+
+            if i < left_size:
+                node = cast(OrderStatisticNode[K, V], node.left_child)
+            else:
+                i -= left_size + 1
+                node = cast(OrderStatisticNode[K, V], node.right_child)
+
+    def count_range(self, low: K, high: K) -> int:
+        """Returns the number of keys with low <= key <= high.
+
+        Args:
+            low: the smallest key of the range
+            high: the biggest key of the range
+
+        Returns:
+            the number of keys in the range
+        """
+        if high < low:
+            return 0
+
+        return self._count_smaller(high, True) - self._count_smaller(low, False)
+
+    def _new_node(self, key: K, value: V) -> OrderStatisticNode[K, V]:
+        return OrderStatisticNode(key, value)
+
+    def _update(self, node: AvlNode[K, V]) -> None:
+        TreeMap._update(self, node)
+
+        statistic_node = cast(OrderStatisticNode[K, V], node)
+        statistic_node.size = (
+            1 + _size(statistic_node.left_child) + _size(statistic_node.right_child)
+        )
+
+    def _count_smaller(self, key: K, inclusive: bool) -> int:
+        # Number of keys < key (or <= key if inclusive): every time the search
+        # goes right, the node and its left subtree are smaller
+        count = 0
+        node = cast(OrderStatisticNode[K, V] | None, self._root)
+        while node is not None:
+            if node.key < key or (inclusive and node.key == key):
+                count += 1 + _size(node.left_child)
+                node = node.right_child
+            else:
+                node = node.left_child
+
+        return count
+
+
+def _size(node: OrderStatisticNode[K, V] | None) -> int:
+    return node.size if node is not None else 0
+
+
+class PersistentTreeMap(BaseTreeMap[K, V]):
+    """An immutable TreeMap, where every update returns a new map.
+
+    put() and delete() never change existing nodes: they copy the O(lg2 n)
+    nodes along the changed path (path copying) and return a new map which
+    shares all the other nodes with the original one. So every map is a
+    snapshot which never changes: it can be read and traversed, even from
+    other threads and without locks, while new versions are created.
+
+    References:
+    * https://en.wikipedia.org/wiki/Persistent_data_structure
+    """
+
+    def __init__(self, items: Iterable[tuple[K, V]] | None = None) -> None:
+        """Construct a new map from the initial (key, value) pairs.
+
+        Args:
+            items: the initial (key, value) pairs for the map (optional).
+                For duplicate keys, the last value wins.
+        """
+        super().__init__()
+
+        # The initial nodes are not shared with any other map yet, so they
+        # can be built in place
+        tree_map = TreeMap(items)
+        self._root = tree_map._root
+        self._size = tree_map._size
+
+    def put(self, key: K, value: V) -> Self:
+        """Returns a new map with the key added, or its value updated.
+
+        Args:
+            key: the key to add
+            value: the value of the key
+
+        Returns:
+            the new map
+        """
+        path: list[AvlNode[K, V]] = []
+        node = self._root
+        while node is not None and key != node.key:
+            path.append(node)
+            node = node.left_child if key < node.key else node.right_child
+
+        if node is None:
+            subtree = self._new_node(key, value)
+            size = self._size + 1
+        else:
+            subtree = self._copy_on_write(node)
+            subtree.value = value
+            size = self._size
+
+        return self._derive(self._rebalance_path(path, key, subtree), size)
+
+    def delete(self, key: K) -> Self:
+        """Returns a new map without the specified key.
+
+        Args:
+            key: the key to remove
+
+        Returns:
+            the new map, or this map if there is no such key
+        """
+        deleted = self._delete_node(key)
+        if deleted is None:
+            return self
+
+        return self._derive(deleted[0], self._size - 1)
+
+    def _copy_on_write(self, node: AvlNode[K, V]) -> AvlNode[K, V]:
+        copied_node = self._new_node(node.key, cast(V, node.value))
+        copied_node.left_child = node.left_child
+        copied_node.right_child = node.right_child
+        self._update(copied_node)
+
+        return copied_node
+
+    def _derive(self, root: AvlNode[K, V] | None, size: int) -> Self:
+        tree_map = type(self)()
+        tree_map._root = root
+        tree_map._size = size
+
+        return tree_map
@@ -57,6 +57,23 @@ def _create_complex_graph() -> TestGraph:
     )
 
 
+def _create_weighted_graph_directed() -> TestGraph:
+    graph = TestGraph()
+    graph.add_edges(
+        [
+            ("a", "b", 4.0),
+            ("a", "c", 1.0),
+            ("c", "b", 2.0),
+            ("b", "d", 1.0),
+            ("c", "d", 5.0),
+            ("d", "e", 3.0),
+            ("f", "a", 1.0),
+        ],
+        bidirectional=False,
+    )
+    return graph
+
+
 EMPTY_GRAPH = _create_empty_graph()
 
 ONE_NODE_GRAPH = _create_one_node_graph()
@@ -66,3 +83,5 @@ SIMPLE_GRAPH = _create_simple_graph()
 SIMPLE_GRAPH_DIRECTED = _create_simple_graph_directed()
 
 COMPLEX_GRAPH = _create_complex_graph()
+
+WEIGHTED_GRAPH_DIRECTED = _create_weighted_graph_directed()
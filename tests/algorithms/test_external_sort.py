@@ -0,0 +1,76 @@
+"""Unit tests for external merge sort."""
+
+import io
+import os
+import random
+from pathlib import Path
+
+import pytest
+
+from my_python_kata.algorithms.external_sort import external_sort
+from my_python_kata.algorithms.external_sort import read_binary_ints
+from my_python_kata.algorithms.external_sort import read_text_ints
+from my_python_kata.algorithms.external_sort import write_binary_ints
+from my_python_kata.algorithms.external_sort import write_text_ints
+
+
+external_sort_test_data = [
+    # Fits into memory
+    (0, 10, 2),
+    (5, 10, 2),
+    # Single merge pass
+    (100, 10, 16),
+    # Multiple merge passes, with a partial last run
+    (1000, 7, 3),
+]
+
+
+@pytest.mark.parametrize("n_values,run_size,fan_in", external_sort_test_data)
+def test_external_sort(
+    tmp_path: Path, n_values: int, run_size: int, fan_in: int
+) -> None:
+    """Test sorting with different amounts of runs and merge passes."""
+    min_value, max_value = -(2**63), 2**63 - 1
+    values = [
+        random.randint(min_value, max_value) for _ in range(n_values)  # noqa: S311
+    ]
+
+    sorted_values = external_sort(
+        iter(values), run_size, fan_in, buffer_size=5, temp_dir=str(tmp_path)
+    )
+
+    assert list(sorted_values) == sorted(values)
+    # Temporary files are removed
+    assert os.listdir(tmp_path) == []
+
+
+def test_external_sort_invalid_parameters() -> None:
+    """Test that invalid parameters are refused immediately."""
+    with pytest.raises(ValueError):
+        external_sort([], fan_in=1)
+
+    with pytest.raises(ValueError):
+        external_sort([], run_size=0)
+
+
+def test_binary_ints_round_trip() -> None:
+    """Test writing and reading back binary integers."""
+    values = list(range(-10, 25))
+    file = io.BytesIO()
+
+    write_binary_ints(values, file, buffer_size=4)
+    file.seek(0)
+
+    assert list(read_binary_ints(file, buffer_size=4)) == values
+
+
+def test_text_ints_round_trip() -> None:
+    """Test writing and reading back text integers, sorting them."""
+    values = [5, -3, 12, 0, 7]
+    file = io.StringIO()
+
+    write_text_ints(values, file)
+    file.write("\n")
+    file.seek(0)
+
+    assert list(external_sort(read_text_ints(file), run_size=2)) == sorted(values)
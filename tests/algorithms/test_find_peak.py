@@ -1,14 +1,25 @@
 """Unit tests for the find_peak module."""
 
+import random
+from array import array
+from pathlib import Path
 from typing import List
 from typing import Optional
+from typing import Sequence
 from typing import cast
 
 import pytest
 
+from my_python_kata.algorithms.find_peak import IntTypecode
 from my_python_kata.algorithms.find_peak import Peak2D
+from my_python_kata.algorithms.find_peak import PeakAlgorithm2D
+from my_python_kata.algorithms.find_peak import find_all_peaks_1d
 from my_python_kata.algorithms.find_peak import find_peak_1d
 from my_python_kata.algorithms.find_peak import find_peak_2d
+from my_python_kata.algorithms.find_peak import find_peaks_batch
+from my_python_kata.algorithms.find_peak import find_peaks_in_file
+from my_python_kata.algorithms.find_peak import find_top_peaks_1d
+from my_python_kata.algorithms.find_peak import iter_peaks_1d
 
 
 find_peak_1d_test_data = [
@@ -37,6 +48,82 @@ def test_find_peak_1d(
         assert array[peak_position] == expectected_peak_value
 
 
+find_all_peaks_1d_test_data = [
+    ([], None, None, []),
+    ([3], None, None, [0]),
+    ([3, 3, 3], None, None, [1]),
+    ([1, 3, 2, 4, 1], None, None, [1, 3]),
+    ([5, 1, 2, 2, 2, 0, 7], None, None, [0, 3, 6]),
+    # A plateau followed by higher values is not a peak
+    ([1, 3, 3, 4, 1], None, None, [3]),
+    # Prominences are 5, 2 (base 2 on the left), 7
+    ([0, 5, 2, 4, 1, 7, 0], 3, None, [1, 5]),
+    ([0, 5, 2, 4, 1, 7, 0], 2, None, [1, 3, 5]),
+    # The lower peak close to a higher one is removed
+    ([0, 5, 1, 4, 1, 6, 0], None, 3, [1, 5]),
+    ([0, 5, 1, 4, 1, 6, 0], None, 2, [1, 3, 5]),
+    # Distance is applied first, then prominence (4 for the peak at 1)
+    ([0, 5, 1, 4, 1, 6, 0], 5, 3, [5]),
+]
+
+
+@pytest.mark.parametrize(
+    "values,min_prominence,min_distance,expected_peaks", find_all_peaks_1d_test_data
+)
+def test_find_all_peaks_1d(
+    values: List[int],
+    min_prominence: Optional[int],
+    min_distance: Optional[int],
+    expected_peaks: List[int],
+) -> None:
+    """Test find_all_peaks_1d() function."""
+    assert find_all_peaks_1d(values, min_prominence, min_distance) == expected_peaks
+    assert (
+        find_all_peaks_1d(array("q", values), min_prominence, min_distance)
+        == expected_peaks
+    )
+
+
+find_top_peaks_1d_test_data = [
+    ([], 2, None, []),
+    ([1, 3, 2, 4, 1], 1, None, [3]),
+    ([1, 3, 2, 4, 1], 5, None, [3, 1]),
+    # Equal peaks in position order
+    ([0, 4, 0, 6, 0, 4, 0], 3, None, [3, 1, 5]),
+    ([0, 4, 0, 6, 0, 4, 0], 3, 3, [3]),
+]
+
+
+@pytest.mark.parametrize(
+    "array,k,min_distance,expected_peaks", find_top_peaks_1d_test_data
+)
+def test_find_top_peaks_1d(
+    array: List[int], k: int, min_distance: Optional[int], expected_peaks: List[int]
+) -> None:
+    """Test find_top_peaks_1d() function."""
+    assert find_top_peaks_1d(array, k, min_distance=min_distance) == expected_peaks
+
+
+def test_iter_peaks_1d() -> None:
+    """Test that peaks straddling chunk boundaries are found once."""
+    chunks = [[1, 3], [3], [], [3, 0, 2], [5, 5], [5, 1]]
+
+    assert list(iter_peaks_1d(chunks)) == [2, 7]
+    assert list(iter_peaks_1d([])) == []
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 100])
+def test_iter_peaks_1d_random(chunk_size: int) -> None:
+    """Test that streaming finds the same peaks as the whole signal search."""
+    values = random.choices(range(5), k=100)  # noqa: S311
+    chunks = (
+        array("q", values[i : i + chunk_size])
+        for i in range(0, len(values), chunk_size)
+    )
+
+    assert list(iter_peaks_1d(chunks)) == find_all_peaks_1d(values)
+
+
 find_peak_2d_test_data = [
     ([[1, 2, 3, 0], [2, 3, 2, 0], [1, 4, 7, 1], [1, 5, 3, 0]], Peak2D(2, 2), 7),
     ([[]], None, None),
@@ -56,10 +143,32 @@ find_peak_2d_test_data = [
     ),
     ([[1], [2], [5], [1]], Peak2D(2, 0), 5),
     ([[1, 2, 1, 0], [2, 8, 2, 0], [1, 4, 2, 1], [1, 5, 1, 0]], Peak2D(1, 1), 8),
-    ([[1, 2, 9, 0], [1, 2, 2, 0], [1, 1, 1, 1], [1, 1, 1, 0]], Peak2D(0, 2), 9),
+    # The middle row is flat, so its first element is already a peak
+    ([[1, 2, 9, 0], [1, 2, 2, 0], [1, 1, 1, 1], [1, 1, 1, 0]], Peak2D(2, 0), 1),
+    ([[1, 2, 9, 0], [1, 2, 8, 0], [0, 1, 1, 1], [1, 1, 1, 0]], Peak2D(0, 2), 9),
 ]
 
 
+@pytest.mark.parametrize("array_2d", [data[0] for data in find_peak_2d_test_data])
+def test_find_peak_2d_window(array_2d: List[List[int]]) -> None:
+    """Test find_peak_2d() function, with the "window" algorithm."""
+    peak_position = find_peak_2d(array_2d, algorithm="window")
+
+    if len(array_2d[0]) == 0:
+        assert peak_position is None
+    else:
+        assert peak_position is not None
+        assert _is_peak_2d(
+            array_2d, cast(int, peak_position.row), cast(int, peak_position.column)
+        )
+
+
+def test_find_peak_2d_unsupported_algorithm() -> None:
+    """Test that an unsupported algorithm is rejected."""
+    with pytest.raises(ValueError):
+        find_peak_2d([[1]], algorithm="unknown")  # type: ignore[arg-type]
+
+
 @pytest.mark.parametrize(
     "array_2d,expected_peak_position,expectected_peak_value", find_peak_2d_test_data
 )
@@ -95,3 +204,151 @@ peak2d_test_data = [
 def test_peak2d_eq(first: Peak2D, second: Peak2D, expected_result: bool) -> None:
     """Test equality between Peak2D instances."""
     assert (first == second) == expected_result
+
+
+def _is_peak_2d(array_2d: Sequence[Sequence[int]], row: int, column: int) -> bool:
+    value = array_2d[row][column]
+    neighbours = [
+        (row - 1, column),
+        (row + 1, column),
+        (row, column - 1),
+        (row, column + 1),
+    ]
+    return all(
+        array_2d[r][c] <= value
+        for r, c in neighbours
+        if 0 <= r < len(array_2d) and 0 <= c < len(array_2d[0])
+    )
+
+
+@pytest.mark.parametrize(
+    "rows,columns", [(1, 1), (1, 7), (7, 1), (2, 2), (10, 10), (33, 17), (5, 64)]
+)
+def test_find_peak_2d_random(rows: int, columns: int) -> None:
+    """Test that the result is a peak, for random arrays of any row type."""
+    for _ in range(20):
+        array_2d = [
+            random.choices(range(10), k=columns) for _ in range(rows)  # noqa: S311
+        ]
+
+        for rows_data in (
+            array_2d,
+            [array("q", row) for row in array_2d],
+            [memoryview(array("q", row)) for row in array_2d],
+        ):
+            for peak in (
+                find_peak_2d(rows_data),
+                find_peak_2d(rows_data, algorithm="window"),
+            ):
+                assert peak is not None
+                assert _is_peak_2d(
+                    array_2d, cast(int, peak.row), cast(int, peak.column)
+                )
+
+
+@pytest.mark.parametrize("rows,columns", [(1, 1), (1, 7), (7, 1), (10, 10), (33, 17)])
+def test_find_peak_2d_memoryview(rows: int, columns: int) -> None:
+    """Test 2-dimensional memory views, as frames stored in flat buffers."""
+    for _ in range(20):
+        array_2d = [
+            random.choices(range(10), k=columns) for _ in range(rows)  # noqa: S311
+        ]
+        flat_buffer = array("q", [value for row in array_2d for value in row])
+        view = memoryview(flat_buffer).cast("B").cast("q", [rows, columns])
+
+        assert find_peak_2d(view) == find_peak_2d(array_2d)
+        assert find_peak_2d(view, algorithm="window") == find_peak_2d(
+            array_2d, algorithm="window"
+        )
+
+
+def test_find_peak_2d_memoryview_not_2d() -> None:
+    """Test that memory views with other dimensions are refused."""
+    with pytest.raises(ValueError):
+        find_peak_2d(memoryview(array("q", [1, 2, 3])))
+
+
+@pytest.mark.parametrize("length", [1, 2, 3, 10, 1000])
+def test_find_peak_1d_random(length: int) -> None:
+    """Test that the result is a peak, for random arrays of any type."""
+    for _ in range(20):
+        values = random.choices(range(10), k=length)  # noqa: S311
+
+        for data in (values, array("q", values), memoryview(array("q", values))):
+            position = cast(int, find_peak_1d(data))
+
+            assert position is not None
+            assert position == 0 or values[position - 1] <= values[position]
+            assert position == length - 1 or values[position + 1] <= values[position]
+
+
+def _random_stack(frames: int, rows: int, columns: int) -> List[List[List[int]]]:
+    return [
+        [random.choices(range(256), k=columns) for _ in range(rows)]  # noqa: S311
+        for _ in range(frames)
+    ]
+
+
+@pytest.mark.parametrize("workers", [None, 1, 3])
+def test_find_peaks_batch(workers: Optional[int]) -> None:
+    """Test that every frame of a stack gets its own peak, in order."""
+    stack = _random_stack(10, 6, 9)
+
+    peaks = find_peaks_batch(stack, workers=workers)
+
+    assert peaks == [find_peak_2d(frame) for frame in stack]
+
+
+def test_find_peaks_batch_window() -> None:
+    """Test batch peak finding with the "window" algorithm."""
+    stack = _random_stack(5, 12, 7)
+
+    peaks = find_peaks_batch(stack, algorithm="window")
+
+    assert peaks == [find_peak_2d(frame, algorithm="window") for frame in stack]
+
+
+def test_find_peaks_batch_empty() -> None:
+    """Test empty stacks and empty frames."""
+    assert find_peaks_batch([]) == []
+    assert find_peaks_batch([[[]], [[1]]]) == [None, Peak2D(0, 0)]
+
+
+@pytest.mark.parametrize(
+    "typecode,algorithm,workers",
+    [("q", "rows", None), ("B", "window", None), ("H", "rows", 2), ("q", "window", 3)],
+)
+def test_find_peaks_in_file(
+    tmp_path: Path,
+    typecode: IntTypecode,
+    algorithm: PeakAlgorithm2D,
+    workers: Optional[int],
+) -> None:
+    """Test peak finding on frames read from a memory mapped file."""
+    stack = _random_stack(7, 5, 11)
+    path = tmp_path / "frames.bin"
+    with open(path, "wb") as file:
+        for frame in stack:
+            for row in frame:
+                array(typecode, row).tofile(file)
+
+    peaks = find_peaks_in_file(str(path), 5, 11, typecode, algorithm, workers)
+
+    assert peaks == [find_peak_2d(frame, algorithm) for frame in stack]
+
+
+def test_find_peaks_in_file_empty(tmp_path: Path) -> None:
+    """Test that an empty file contains no frames."""
+    path = tmp_path / "frames.bin"
+    path.write_bytes(b"")
+
+    assert find_peaks_in_file(str(path), 3, 3) == []
+
+
+def test_find_peaks_in_file_invalid_size(tmp_path: Path) -> None:
+    """Test that files with a partial frame are refused."""
+    path = tmp_path / "frames.bin"
+    path.write_bytes(array("q", range(10)).tobytes())
+
+    with pytest.raises(ValueError):
+        find_peaks_in_file(str(path), 3, 3)
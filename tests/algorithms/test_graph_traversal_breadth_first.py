@@ -3,11 +3,13 @@
 import pytest
 
 from my_python_kata.algorithms.graph_traversal import bft
+from my_python_kata.algorithms.graph_traversal import iter_bft
 
 from .graph_test_support import COMPLEX_GRAPH
 from .graph_test_support import EMPTY_GRAPH
 from .graph_test_support import ONE_NODE_GRAPH
 from .graph_test_support import SIMPLE_GRAPH
+from .graph_test_support import SIMPLE_GRAPH_DIRECTED
 from .graph_test_support import TestGraph
 
 
@@ -50,3 +52,77 @@ def test_bft(
     bft(graph, start_node, track_node)
 
     assert visited_nodes == expected_visited_nodes
+
+
+@pytest.mark.parametrize(
+    "graph,start_node,action_return_value,expected_visited_nodes", test_bft_data
+)
+def test_bft_frozen_graph(
+    graph: TestGraph,
+    start_node: str,
+    action_return_value: bool,
+    expected_visited_nodes: set[str],
+) -> None:
+    """Test that Breadth-First Search works correctly on frozen graphs."""
+    visited_nodes: set[str] = set()
+
+    def track_node(node: str) -> bool:
+        visited_nodes.add(node)
+        return action_return_value
+
+    bft(graph.freeze(), start_node, track_node)
+
+    assert visited_nodes == expected_visited_nodes
+
+
+test_iter_bft_data = [
+    (EMPTY_GRAPH, "0", []),
+    (ONE_NODE_GRAPH, "0", [("0", 0)]),
+    (SIMPLE_GRAPH, "1", [("1", 0), ("0", 1), ("2", 2), ("3", 2)]),
+    (SIMPLE_GRAPH_DIRECTED, "1", [("1", 0)]),
+    (
+        COMPLEX_GRAPH,
+        "0",
+        [
+            ("0", 0),
+            ("7", 1),
+            ("9", 1),
+            ("11", 1),
+            ("6", 2),
+            ("10", 2),
+            ("8", 2),
+            ("5", 3),
+            ("12", 3),
+            ("2", 4),
+            ("3", 5),
+            ("4", 6),
+        ],
+    ),
+]
+
+
+@pytest.mark.parametrize("frozen", [False, True])
+@pytest.mark.parametrize("graph,start_node,expected_visits", test_iter_bft_data)
+def test_iter_bft(
+    graph: TestGraph,
+    start_node: str,
+    expected_visits: list[tuple[str, int]],
+    frozen: bool,
+) -> None:
+    """Test that lazy Breadth-First Search yields every node once, with depth."""
+    visits = list(iter_bft(graph.freeze() if frozen else graph, start_node))
+
+    assert visits == expected_visits
+
+
+def test_iter_bft_dense_graph() -> None:
+    """Test that nodes are never enqueued twice, even on complete graphs."""
+    graph = TestGraph()
+    nodes = [str(i) for i in range(50)]
+    graph.add_edges((a, b, 1.0) for a in nodes for b in nodes if a != b)
+
+    visits = list(iter_bft(graph, "0"))
+
+    assert len(visits) == len(nodes)
+    assert {node for node, _ in visits} == set(nodes)
+    assert max(depth for _, depth in visits) == 1
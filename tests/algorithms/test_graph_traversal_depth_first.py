@@ -0,0 +1,149 @@
+"""Unit tests for graph Depth-First graph traversal."""
+
+from typing import Optional
+
+import pytest
+
+from my_python_kata.algorithms.graph_traversal import DftEvent
+from my_python_kata.algorithms.graph_traversal import dft
+from my_python_kata.algorithms.graph_traversal import iter_dft
+
+from .graph_test_support import COMPLEX_GRAPH
+from .graph_test_support import EMPTY_GRAPH
+from .graph_test_support import ONE_NODE_GRAPH
+from .graph_test_support import SIMPLE_GRAPH
+from .graph_test_support import SIMPLE_GRAPH_DIRECTED
+from .graph_test_support import WEIGHTED_GRAPH_DIRECTED
+from .graph_test_support import TestGraph
+
+
+DISCOVER = DftEvent.DISCOVER
+FINISH = DftEvent.FINISH
+
+test_iter_dft_data = [
+    (EMPTY_GRAPH, "0", []),
+    (ONE_NODE_GRAPH, "not-present", []),
+    (ONE_NODE_GRAPH, "0", [("0", DISCOVER), ("0", FINISH)]),
+    (
+        SIMPLE_GRAPH,
+        "1",
+        [
+            ("1", DISCOVER),
+            ("0", DISCOVER),
+            ("2", DISCOVER),
+            ("2", FINISH),
+            ("3", DISCOVER),
+            ("3", FINISH),
+            ("0", FINISH),
+            ("1", FINISH),
+        ],
+    ),
+    (SIMPLE_GRAPH_DIRECTED, "1", [("1", DISCOVER), ("1", FINISH)]),
+    # Without a start node, all nodes are visited
+    (
+        SIMPLE_GRAPH_DIRECTED,
+        None,
+        [
+            ("0", DISCOVER),
+            ("1", DISCOVER),
+            ("1", FINISH),
+            ("2", DISCOVER),
+            ("2", FINISH),
+            ("3", DISCOVER),
+            ("3", FINISH),
+            ("0", FINISH),
+        ],
+    ),
+    (
+        WEIGHTED_GRAPH_DIRECTED,
+        "c",
+        [
+            ("c", DISCOVER),
+            ("b", DISCOVER),
+            ("d", DISCOVER),
+            ("e", DISCOVER),
+            ("e", FINISH),
+            ("d", FINISH),
+            ("b", FINISH),
+            ("c", FINISH),
+        ],
+    ),
+]
+
+
+@pytest.mark.parametrize("frozen", [False, True])
+@pytest.mark.parametrize("graph,start_node,expected_events", test_iter_dft_data)
+def test_iter_dft(
+    graph: TestGraph,
+    start_node: Optional[str],
+    expected_events: list[tuple[str, DftEvent]],
+    frozen: bool,
+) -> None:
+    """Test that Depth-First Search yields discover and finish events."""
+    events = list(iter_dft(graph.freeze() if frozen else graph, start_node))
+
+    assert events == expected_events
+
+
+@pytest.mark.parametrize("frozen", [False, True])
+def test_iter_dft_whole_graph(frozen: bool) -> None:
+    """Test that every node is discovered and finished exactly once."""
+    graph = COMPLEX_GRAPH.freeze() if frozen else COMPLEX_GRAPH
+
+    events = list(iter_dft(graph))
+
+    assert sorted(node for node, event in events if event is DISCOVER) == sorted(
+        graph.get_nodes()
+    )
+    assert sorted(node for node, event in events if event is FINISH) == sorted(
+        graph.get_nodes()
+    )
+
+
+@pytest.mark.parametrize("frozen", [False, True])
+def test_iter_dft_deep_graph(frozen: bool) -> None:
+    """Test that deep graphs do not hit the recursion limit."""
+    graph = TestGraph()
+    graph.add_edges(((str(i), str(i + 1), 1.0) for i in range(20_000)), False)
+
+    events = list(iter_dft(graph.freeze() if frozen else graph, "0"))
+
+    assert len(events) == 2 * graph.size()
+    assert events[graph.size() - 1] == ("20000", DISCOVER)
+    assert events[graph.size()] == ("20000", FINISH)
+    assert events[-1] == ("0", FINISH)
+
+
+test_dft_data = [
+    (True, True, ["1", "0", "2", "3"], ["2", "3", "0", "1"]),
+    (False, True, ["1"], []),
+    (True, False, ["1", "0", "2"], ["2"]),
+]
+
+
+@pytest.mark.parametrize(
+    "discover_return_value,finish_return_value,expected_discovered,expected_finished",
+    test_dft_data,
+)
+def test_dft(
+    discover_return_value: bool,
+    finish_return_value: bool,
+    expected_discovered: list[str],
+    expected_finished: list[str],
+) -> None:
+    """Test that Depth-First traversal invokes callbacks and honours stops."""
+    discovered_nodes: list[str] = []
+    finished_nodes: list[str] = []
+
+    def on_discover(node: str) -> bool:
+        discovered_nodes.append(node)
+        return discover_return_value
+
+    def on_finish(node: str) -> bool:
+        finished_nodes.append(node)
+        return finish_return_value
+
+    dft(SIMPLE_GRAPH, "1", on_discover, on_finish)
+
+    assert discovered_nodes == expected_discovered
+    assert finished_nodes == expected_finished
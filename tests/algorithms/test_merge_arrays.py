@@ -1,7 +1,15 @@
 """Unit tests for arrays merge."""
 
+import io
+import random
+from array import array
+from typing import Iterator
+from typing import Optional
+
 import pytest
 
+from my_python_kata.algorithms.merge_arrays import MergeBackend
+from my_python_kata.algorithms.merge_arrays import iter_merge
 from my_python_kata.algorithms.merge_arrays import merge_arrays
 
 
@@ -36,6 +44,12 @@ merge_arrays_test_data = [
     ([[1, 2, 3]], [1, 2, 3]),
     # No arrays at all
     ([], []),
+    # Many arrays, merged using a heap
+    (
+        [[5, 9], [], [1, 2, 3], [0], [4, 4, 10], [2, 8], [], [6]],
+        [0, 1, 2, 2, 3, 4, 4, 5, 6, 8, 9, 10],
+    ),
+    ([[1], [1], [0], [0], [1], [2]], [0, 0, 1, 1, 1, 2]),
 ]
 
 
@@ -45,3 +59,119 @@ def test_merge_arrays(
 ) -> None:
     """Test that merging works."""
     assert merge_arrays(arrays) == expected_result_array
+
+
+@pytest.mark.parametrize("n_arrays", [2, 3, 4, 5, 17, 100])
+def test_merge_arrays_random(n_arrays: int) -> None:
+    """Test merging random arrays, with both pairwise and heap strategies."""
+    arrays = [
+        sorted(random.choices(range(1000), k=random.randint(0, 50)))  # noqa: S311
+        for _ in range(n_arrays)
+    ]
+    arrays_copy = [array.copy() for array in arrays]
+
+    merged = merge_arrays(arrays)
+
+    assert merged == sorted(value for array in arrays for value in array)
+    # Input arrays are not modified
+    assert arrays == arrays_copy
+
+
+@pytest.mark.parametrize("arrays,expected_result_array", merge_arrays_test_data)
+def test_iter_merge(arrays: list[list[int]], expected_result_array: list[int]) -> None:
+    """Test that lazy merging works with generators."""
+
+    def generate(array: list[int]) -> Iterator[int]:
+        yield from array
+
+    assert list(iter_merge(*(generate(array) for array in arrays))) == (
+        expected_result_array
+    )
+
+
+def test_iter_merge_is_lazy() -> None:
+    """Test that values are produced without consuming the whole inputs."""
+    consumed_values: list[int] = []
+
+    def generate(start: int) -> Iterator[int]:
+        value = start
+        while True:
+            consumed_values.append(value)
+            yield value
+            value += 3
+
+    merged = iter_merge(generate(0), generate(1), generate(2))
+
+    assert [next(merged) for _ in range(7)] == [0, 1, 2, 3, 4, 5, 6]
+    assert len(consumed_values) <= 10
+
+
+def test_iter_merge_key_and_stability() -> None:
+    """Test merging text lines from files, using a key function."""
+    first = io.StringIO("1\n10\n200\n")
+    second = io.StringIO("2\n10\n30\n")
+
+    merged = [line.strip() for line in iter_merge(first, second, key=int)]
+
+    assert merged == ["1", "2", "10", "10", "30", "200"]
+
+    pairs = [(1, "a"), (2, "a")], [(1, "b"), (2, "b")]
+
+    assert list(iter_merge(*pairs, key=lambda pair: pair[0])) == [
+        (1, "a"),
+        (1, "b"),
+        (2, "a"),
+        (2, "b"),
+    ]
+
+
+@pytest.mark.parametrize("backend", ["python", "sort"])
+@pytest.mark.parametrize("arrays,expected_result_array", merge_arrays_test_data)
+def test_merge_arrays_backends(
+    arrays: list[list[int]], expected_result_array: list[int], backend: MergeBackend
+) -> None:
+    """Test that all backends merge correctly."""
+    assert merge_arrays(arrays, backend) == expected_result_array
+
+
+@pytest.mark.parametrize("backend", [None, "python", "sort"])
+@pytest.mark.parametrize("arrays,expected_result_array", merge_arrays_test_data)
+def test_merge_typed_arrays(
+    arrays: list[list[int]],
+    expected_result_array: list[int],
+    backend: Optional[MergeBackend],
+) -> None:
+    """Test that typed arrays can be merged too."""
+    typed_arrays = [array("q", values) for values in arrays]
+
+    assert merge_arrays(typed_arrays, backend) == expected_result_array
+
+
+def test_merge_arrays_unsupported_backend() -> None:
+    """Test that unknown backends are refused."""
+    with pytest.raises(ValueError):
+        merge_arrays([[1]], "unknown")  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("backend", ["python", "sort"])
+@pytest.mark.parametrize("workers", [2, 3])
+def test_merge_arrays_in_parallel(backend: MergeBackend, workers: int) -> None:
+    """Test that merging in worker processes gives the same result."""
+    arrays = [
+        sorted(random.choices(range(-500, 500), k=random.randint(0, 300)))  # noqa: S311
+        for _ in range(20)
+    ]
+    # Many duplicates, so that some partitions are empty
+    arrays.append([7] * 500)
+
+    merged = merge_arrays(arrays, backend, workers)
+
+    assert merged == sorted(value for values in arrays for value in values)
+
+
+@pytest.mark.parametrize("arrays,expected_result_array", merge_arrays_test_data)
+def test_merge_arrays_in_parallel_corner_cases(
+    arrays: list[list[int]], expected_result_array: list[int]
+) -> None:
+    """Test that merging in parallel works for small inputs too."""
+    assert merge_arrays(arrays, workers=2) == expected_result_array
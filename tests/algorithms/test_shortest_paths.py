@@ -0,0 +1,129 @@
+"""Unit tests for shortest paths algorithms."""
+
+from itertools import pairwise
+from typing import Optional
+
+import pytest
+
+from my_python_kata.algorithms.shortest_paths import dijkstra
+from my_python_kata.algorithms.shortest_paths import shortest_hop_path
+
+from .graph_test_support import COMPLEX_GRAPH
+from .graph_test_support import EMPTY_GRAPH
+from .graph_test_support import WEIGHTED_GRAPH_DIRECTED
+from .graph_test_support import TestGraph
+
+
+test_dijkstra_data = [
+    (EMPTY_GRAPH, "a", None, {}),
+    (
+        WEIGHTED_GRAPH_DIRECTED,
+        "a",
+        None,
+        {"a": 0.0, "c": 1.0, "b": 3.0, "d": 4.0, "e": 7.0},
+    ),
+    (WEIGHTED_GRAPH_DIRECTED, "d", None, {"d": 0.0, "e": 3.0}),
+    (WEIGHTED_GRAPH_DIRECTED, "e", None, {"e": 0.0}),
+    # Early exit, nodes farther than the target are not settled
+    (WEIGHTED_GRAPH_DIRECTED, "a", "b", {"a": 0.0, "c": 1.0, "b": 3.0}),
+    (COMPLEX_GRAPH, "4", "12", {"4": 0.0, "3": 1.0, "2": 2.0, "12": 3.0}),
+]
+
+
+@pytest.mark.parametrize("frozen", [False, True])
+@pytest.mark.parametrize("graph,source,target,expected_distances", test_dijkstra_data)
+def test_dijkstra_distances(
+    graph: TestGraph,
+    source: str,
+    target: Optional[str],
+    expected_distances: dict[str, float],
+    frozen: bool,
+) -> None:
+    """Test that Dijkstra computes the expected distances."""
+    result = dijkstra(graph.freeze() if frozen else graph, source, target)
+
+    assert result.distances == expected_distances
+
+
+test_dijkstra_path_data = [
+    (WEIGHTED_GRAPH_DIRECTED, "a", "e", ["a", "c", "b", "d", "e"]),
+    (WEIGHTED_GRAPH_DIRECTED, "f", "d", ["f", "a", "c", "b", "d"]),
+    (WEIGHTED_GRAPH_DIRECTED, "a", "a", ["a"]),
+    (WEIGHTED_GRAPH_DIRECTED, "e", "a", []),  # Unreachable
+    (WEIGHTED_GRAPH_DIRECTED, "not-present", "a", []),
+    (COMPLEX_GRAPH, "2", "5", ["2", "12", "8", "9", "0", "7", "6", "5"]),
+]
+
+
+@pytest.mark.parametrize("frozen", [False, True])
+@pytest.mark.parametrize("graph,source,target,expected_path", test_dijkstra_path_data)
+def test_dijkstra_path(
+    graph: TestGraph,
+    source: str,
+    target: str,
+    expected_path: list[str],
+    frozen: bool,
+) -> None:
+    """Test that Dijkstra tracks predecessors along the shortest path."""
+    result = dijkstra(graph.freeze() if frozen else graph, source, target)
+
+    assert result.path_to(target) == expected_path
+
+
+@pytest.mark.parametrize("frozen", [False, True])
+def test_dijkstra_negative_weight(frozen: bool) -> None:
+    """Test that negative weights are refused."""
+    graph = TestGraph()
+    graph.connect("a", "b", -1.0)
+
+    with pytest.raises(ValueError):
+        dijkstra(graph.freeze() if frozen else graph, "a")
+
+
+test_shortest_hop_path_data = [
+    (EMPTY_GRAPH, "a", "b", []),
+    (WEIGHTED_GRAPH_DIRECTED, "a", "a", ["a"]),
+    (WEIGHTED_GRAPH_DIRECTED, "a", "b", ["a", "b"]),  # Weights are ignored
+    (WEIGHTED_GRAPH_DIRECTED, "f", "e", ["f", "a", "b", "d", "e"]),
+    (WEIGHTED_GRAPH_DIRECTED, "e", "a", []),  # Edges are directed
+    (WEIGHTED_GRAPH_DIRECTED, "a", "not-present", []),
+    (COMPLEX_GRAPH, "2", "5", ["2", "12", "8", "9", "0", "7", "6", "5"]),
+    (COMPLEX_GRAPH, "4", "10", ["4", "3", "2", "12", "8", "9", "10"]),
+]
+
+
+@pytest.mark.parametrize("frozen", [False, True])
+@pytest.mark.parametrize(
+    "graph,source,target,expected_path", test_shortest_hop_path_data
+)
+def test_shortest_hop_path(
+    graph: TestGraph,
+    source: str,
+    target: str,
+    expected_path: list[str],
+    frozen: bool,
+) -> None:
+    """Test that bidirectional search finds the path with fewest edges."""
+    path = shortest_hop_path(graph.freeze() if frozen else graph, source, target)
+
+    assert path == expected_path
+
+
+def test_shortest_hop_path_grid() -> None:
+    """Test that the path length is optimal on graphs with many equal paths."""
+    graph = TestGraph()
+    size = 8
+    graph.add_edges(
+        (f"{r},{c}", f"{r},{c + 1}", 1.0) for r in range(size) for c in range(size - 1)
+    )
+    graph.add_edges(
+        (f"{r},{c}", f"{r + 1},{c}", 1.0) for r in range(size - 1) for c in range(size)
+    )
+
+    path = shortest_hop_path(graph, "0,0", f"{size - 1},{size - 1}")
+
+    assert len(path) == 2 * (size - 1) + 1
+    assert path[0] == "0,0"
+    assert path[-1] == f"{size - 1},{size - 1}"
+    for source, target in pairwise(path):
+        assert graph.is_edge_present(source, target)
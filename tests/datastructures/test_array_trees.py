@@ -0,0 +1,143 @@
+"""Unit tests for array_trees module."""
+
+from typing import Callable
+from typing import Iterator
+from typing import List
+
+import pytest
+
+from my_python_kata.datastructures.array_trees import NO_NODE
+from my_python_kata.datastructures.array_trees import ArrayTree
+from my_python_kata.datastructures.array_trees import IndexActionCallback
+from my_python_kata.datastructures.array_trees import iter_in_order
+from my_python_kata.datastructures.array_trees import iter_post_order
+from my_python_kata.datastructures.array_trees import iter_pre_order
+from my_python_kata.datastructures.array_trees import visit_in_order
+from my_python_kata.datastructures.array_trees import visit_post_order
+from my_python_kata.datastructures.array_trees import visit_pre_order
+from my_python_kata.datastructures.binary_trees import build_balanced
+
+from .binary_trees_test_support import EMPTY_BINARY_TREE
+from .binary_trees_test_support import SINGLE_NODE_BINARY_TREE
+from .binary_trees_test_support import THREE_NODES_BINARY_TREE
+from .binary_trees_test_support import TestNode
+
+
+def test_build_tree() -> None:
+    """Test adding and linking nodes."""
+    tree = ArrayTree[str, str]()
+
+    assert tree.size() == 0
+    assert tree.root == NO_NODE
+
+    root = tree.add_node("root", "root_value")
+    left = tree.add_node("left")
+    tree.set_left_child(root, left)
+    tree.set_value(left, "left_value")
+
+    assert tree.size() == 2
+    assert tree.root == root
+    assert tree.get_key(root) == "root"
+    assert tree.get_value(left) == "left_value"
+    assert tree.get_left_child(root) == left
+    assert tree.get_right_child(root) == NO_NODE
+
+
+def test_typed_arrays() -> None:
+    """Test storing keys and values into typed arrays."""
+    tree = ArrayTree[int, float]("q", "d")
+
+    root = tree.add_node(10, 1.5)
+    tree.set_right_child(root, tree.add_node(20, 2.5))
+
+    assert [tree.get_key(i) for i in iter_in_order(tree, tree.root)] == [10, 20]
+    assert tree.get_value(1) == 2.5
+
+
+# Just a shortcut for improving readability
+VisitFunctionType = Callable[[ArrayTree[str, str], int, IndexActionCallback], None]
+
+test_visit_data = [
+    (visit_in_order, EMPTY_BINARY_TREE, []),
+    (visit_in_order, SINGLE_NODE_BINARY_TREE, ["root"]),
+    (visit_in_order, THREE_NODES_BINARY_TREE, ["left", "root", "right"]),
+    (visit_pre_order, EMPTY_BINARY_TREE, []),
+    (visit_pre_order, SINGLE_NODE_BINARY_TREE, ["root"]),
+    (visit_pre_order, THREE_NODES_BINARY_TREE, ["root", "left", "right"]),
+    (visit_post_order, EMPTY_BINARY_TREE, []),
+    (visit_post_order, SINGLE_NODE_BINARY_TREE, ["root"]),
+    (visit_post_order, THREE_NODES_BINARY_TREE, ["left", "right", "root"]),
+]
+
+
+@pytest.mark.parametrize(
+    "visit_function,tree_root_node,expected_visited_items", test_visit_data
+)
+def test_visit(
+    visit_function: VisitFunctionType,
+    tree_root_node: TestNode | None,
+    expected_visited_items: List[str],
+) -> None:
+    """Ensure that trees copied from nodes are visited in the same order."""
+    tree = ArrayTree.from_node(tree_root_node)
+    collected_keys: List[str] = []
+
+    def collect(index: int) -> bool:
+        collected_keys.append(tree.get_key(index))
+        return True
+
+    visit_function(tree, tree.root, collect)
+
+    assert collected_keys == expected_visited_items
+
+
+# Just a shortcut for improving readability
+IterFunctionType = Callable[[ArrayTree[int, str], int], Iterator[int]]
+
+test_iter_visit_data = [
+    (iter_in_order, [0, 1, 2, 3, 4, 5, 6]),
+    (iter_pre_order, [3, 1, 0, 2, 5, 4, 6]),
+    (iter_post_order, [0, 2, 1, 4, 6, 5, 3]),
+]
+
+
+@pytest.mark.parametrize("iter_function,expected_keys", test_iter_visit_data)
+def test_from_sorted(iter_function: IterFunctionType, expected_keys: List[int]) -> None:
+    """Ensure that sorted pairs are built into the same tree as build_balanced()."""
+    items = [(key, str(key)) for key in range(7)]
+    tree = ArrayTree.from_sorted(items, key_typecode="q")
+
+    # Nodes are stored in key order
+    assert list(iter_function(tree, tree.root)) == expected_keys
+
+    from_nodes = ArrayTree.from_node(build_balanced(items))
+    visited_indices = iter_function(from_nodes, from_nodes.root)
+    assert [from_nodes.get_key(index) for index in visited_indices] == expected_keys
+
+
+def test_iter_subtree() -> None:
+    """Ensure that a subtree can be visited starting from its root."""
+    tree = ArrayTree.from_sorted([(key, str(key)) for key in range(7)])
+
+    assert list(iter_in_order(tree, tree.get_right_child(tree.root))) == [4, 5, 6]
+    assert list(iter_in_order(tree, NO_NODE)) == []
+
+
+@pytest.mark.parametrize(
+    "iter_function,expected_keys",
+    [
+        (iter_in_order, list(range(5000))),
+        (iter_pre_order, list(range(5000))),
+        (iter_post_order, list(range(4999, -1, -1))),
+    ],
+)
+def test_deep_tree(iter_function: IterFunctionType, expected_keys: List[int]) -> None:
+    """Ensure that degenerate trees deeper than the recursion limit are visited."""
+    tree = ArrayTree[int, str]("q")
+    for key in range(5000):
+        index = tree.add_node(key)
+        if index > 0:
+            # Every node is the right child of the previous one
+            tree.set_right_child(index - 1, index)
+
+    assert list(iter_function(tree, tree.root)) == expected_keys
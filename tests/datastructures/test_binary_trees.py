@@ -1,13 +1,20 @@
 """Unit tests for binary_trees module."""
 
 from typing import Callable
+from typing import Iterator
 from typing import List
 from typing import Optional
 
 import pytest
 
 from my_python_kata.datastructures.binary_trees import ActionCallback
+from my_python_kata.datastructures.binary_trees import Node
+from my_python_kata.datastructures.binary_trees import build_balanced
 from my_python_kata.datastructures.binary_trees import is_empty
+from my_python_kata.datastructures.binary_trees import iter_in_order
+from my_python_kata.datastructures.binary_trees import iter_post_order
+from my_python_kata.datastructures.binary_trees import iter_pre_order
+from my_python_kata.datastructures.binary_trees import to_sorted_list
 from my_python_kata.datastructures.binary_trees import visit_in_order
 from my_python_kata.datastructures.binary_trees import visit_post_order
 from my_python_kata.datastructures.binary_trees import visit_pre_order
@@ -92,3 +99,111 @@ def test_inorder_visit(
     visit_function(tree_root_node, collect)
 
     assert collected_nodes == expected_visited_items
+
+
+def _build_full_tree(depth: int, first_key: int = 0) -> Node[int, None] | None:
+    # Keys are assigned in in-order order
+    if depth == 0:
+        return None
+    left_size = 2 ** (depth - 1) - 1
+    return Node(
+        first_key + left_size,
+        None,
+        _build_full_tree(depth - 1, first_key),
+        _build_full_tree(depth - 1, first_key + left_size + 1),
+    )
+
+
+# Just a shortcut for improving readability
+IterFunctionType = Callable[[Optional[Node[int, None]]], Iterator[Node[int, None]]]
+
+test_iter_visit_data = [
+    (iter_in_order, [0, 1, 2, 3, 4, 5, 6]),
+    (iter_pre_order, [3, 1, 0, 2, 5, 4, 6]),
+    (iter_post_order, [0, 2, 1, 4, 6, 5, 3]),
+]
+
+
+@pytest.mark.parametrize("iter_function,expected_keys", test_iter_visit_data)
+def test_iter_visit(iter_function: IterFunctionType, expected_keys: List[int]) -> None:
+    """Ensure that lazy visits produce the nodes in the right order."""
+    tree = _build_full_tree(3)
+
+    assert [node.key for node in iter_function(tree)] == expected_keys
+    assert list(iter_function(None)) == []
+
+
+@pytest.mark.parametrize(
+    "iter_function", [iter_in_order, iter_pre_order, iter_post_order]
+)
+def test_iter_visit_early_stop(iter_function: IterFunctionType) -> None:
+    """Ensure that lazy visits can be stopped at any time."""
+    iterator = iter_function(_build_full_tree(3))
+
+    assert len([next(iterator) for _ in range(3)]) == 3
+
+
+test_deep_visit_data = [
+    (visit_in_order, list(range(5000))),
+    (visit_pre_order, list(range(5000))),
+    (visit_post_order, list(range(4999, -1, -1))),
+]
+
+
+@pytest.mark.parametrize("visit_function,expected_keys", test_deep_visit_data)
+def test_deep_visit(
+    visit_function: VisitFunctionType, expected_keys: List[int]
+) -> None:
+    """Ensure that degenerate trees deeper than the recursion limit are visited."""
+    tree: Node[int, None] | None = None
+    for key in range(4999, -1, -1):
+        # Every node is the right child of the previous one
+        tree = Node(key, None, None, tree)
+
+    collected_keys: List[int] = []
+
+    def collect(node: Node[int, None]) -> bool:
+        collected_keys.append(node.key)
+        return True
+
+    visit_function(tree, collect)  # type: ignore[arg-type]
+
+    assert collected_keys == expected_keys
+
+
+@pytest.mark.parametrize("n_items", [0, 1, 2, 3, 7, 10, 100000])
+def test_build_balanced(n_items: int) -> None:
+    """Ensure that sorted pairs are built into a balanced tree and back."""
+    items = [(key, str(key)) for key in range(n_items)]
+
+    tree = build_balanced(items)
+
+    assert to_sorted_list(tree) == items
+
+    # Perfectly balanced: every level but the last one is full
+    depth = 0
+    level = [tree] if tree else []
+    while level:
+        depth += 1
+        level = [
+            child
+            for node in level
+            for child in (node.left_child, node.right_child)
+            if child
+        ]
+    assert depth == n_items.bit_length()
+
+
+def test_build_balanced_node_factory() -> None:
+    """Ensure that nodes are created by the node factory."""
+    created_keys: List[str] = []
+
+    def create_node(key: str, value: str) -> TestNode:
+        created_keys.append(key)
+        return TestNode(key, value.upper())
+
+    tree = build_balanced([("a", "x"), ("b", "y"), ("c", "z")], create_node)
+
+    assert sorted(created_keys) == ["a", "b", "c"]
+    assert to_sorted_list(tree) == [("a", "X"), ("b", "Y"), ("c", "Z")]
+    assert tree is not None and tree.key == "b"
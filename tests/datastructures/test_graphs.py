@@ -181,3 +181,96 @@ def test_from_list(
         expected_edge_weight = expected_edge[1]
         assert expected_edge_key in graph._edges_weight
         assert graph._edges_weight[expected_edge_key] == expected_edge_weight
+
+
+@pytest.mark.parametrize(
+    "graph",
+    [EMPTY_GRAPH, ONE_NODE_GRAPH, SIMPLE_GRAPH, SIMPLE_GRAPH_DIRECTED, COMPLEX_GRAPH],
+)
+def test_freeze(graph: TestGraph) -> None:
+    """Test that a frozen graph exposes the same nodes and edges of its source."""
+    frozen_graph = graph.freeze()
+
+    assert frozen_graph.size() == graph.size()
+
+    for node in graph._nodes:
+        assert frozen_graph.contains(node)
+        assert frozen_graph.get_connected_nodes(node) == graph.get_connected_nodes(node)
+
+    for source_node, target_node in graph._edges_weight:
+        assert frozen_graph.is_edge_present(source_node, target_node)
+
+    assert not frozen_graph.contains("not-present")
+    assert frozen_graph.get_connected_nodes("not-present") == []
+    assert not frozen_graph.is_edge_present("not-present", "0")
+
+
+def test_freeze_integer_ids() -> None:
+    """Test that frozen graphs expose dense node ids and edge weights."""
+    graph = TestGraph()
+    graph.connect("a", "b", 2.0, bidirectional=False)
+    graph.connect("a", "c", 3.0)
+    graph.set_data("a", "data-a")
+
+    frozen_graph = graph.freeze()
+
+    assert frozen_graph.get_node_id("a") == 0
+    assert frozen_graph.get_node_id("not-present") is None
+    assert frozen_graph.get_node(1) == "b"
+    assert list(frozen_graph.get_connected_ids(0)) == [1, 2]
+    assert list(frozen_graph.get_connected_weights(0)) == [2.0, 3.0]
+    assert list(frozen_graph.get_connected_ids(1)) == []
+    assert frozen_graph.get_data("a") == "data-a"
+
+    # Snapshots are not affected by later changes to the source graph
+    graph.connect("b", "d")
+
+    assert frozen_graph.size() == 3
+    assert not frozen_graph.is_edge_present("b", "d")
+
+
+def test_connect_ignores_duplicate_edges() -> None:
+    """Test that connecting the same nodes twice keeps a single edge."""
+    graph = TestGraph()
+
+    graph.connect("a", "b", 2.0)
+    graph.connect("a", "b", 3.0)
+    graph.connect("b", "a", 4.0, bidirectional=False)
+
+    assert graph.get_connected_nodes("a") == ["b"]
+    assert graph.get_connected_nodes("b") == ["a"]
+    assert graph._edges_weight[TestEdge("a", "b")] == 2.0
+
+
+@pytest.mark.parametrize("bidirectional", [True, False])
+def test_add_edges(bidirectional: bool) -> None:
+    """Test that bulk insertion of edges behaves like connect()."""
+    edges = [("a", "b", 2.0), ("a", "c", 3.0), ("c", "a", 4.0), ("a", "b", 5.0)]
+
+    expected_graph = TestGraph()
+    for source, target, weight in edges:
+        expected_graph.connect(source, target, weight, bidirectional)
+
+    graph = TestGraph()
+    graph.add_edges(edges, bidirectional)
+
+    assert graph._nodes == expected_graph._nodes
+    assert graph._reverse_nodes == expected_graph._reverse_nodes
+    assert graph._edges_weight == expected_graph._edges_weight
+
+
+@pytest.mark.parametrize(
+    "graph,node,expected_incoming_nodes",
+    [
+        (SIMPLE_GRAPH_DIRECTED, "1", ["0"]),
+        (SIMPLE_GRAPH_DIRECTED, "0", []),
+        (COMPLEX_GRAPH, "9", ["0", "10", "8"]),
+        (COMPLEX_GRAPH, "not-existing", []),
+    ],
+)
+def test_get_incoming_nodes(
+    graph: TestGraph, node: str, expected_incoming_nodes: list[str]
+) -> None:
+    """Test that the reverse adjacency index is kept up to date."""
+    assert graph.get_incoming_nodes(node) == expected_incoming_nodes
+    assert graph.freeze().get_incoming_nodes(node) == expected_incoming_nodes
@@ -1,16 +1,22 @@
 """Unit tests for the heap module."""
 
+import random
 from typing import List
 
 import pytest
 
+from my_python_kata.datastructures.heaps import Heap
+from my_python_kata.datastructures.heaps import IndexedHeap
+from my_python_kata.datastructures.heaps import IndexedMaxHeap
+from my_python_kata.datastructures.heaps import IndexedMinHeap
 from my_python_kata.datastructures.heaps import MaxHeap
+from my_python_kata.datastructures.heaps import MinHeap
 
 
 max_heap_heapify_test_data = [
     ([3, 9, 2, 1, 4, 5], [9, 4, 5, 1, 3, 2]),
     ([3, 2, 1], [3, 2, 1]),  # Already sorted
-    ([1, 2, 3], [3, 1, 2]),
+    ([1, 2, 3], [3, 2, 1]),
     ([1, 2], [2, 1]),
     ([1], [1]),
     ([], []),
@@ -108,6 +114,8 @@ max_heap_remove_test_data = [
     ([2, 1], 2, 2, [1]),
     ([3, 1, 2], 1, 1, [3, 2]),
     ([3, 9, 2, 1, 4, 5], 4, 4, [9, 3, 5, 1, 2]),
+    # The last item, moved in place of the removed one, must go up
+    ([10, 5, 9, 1, 2, 8, 7], 1, 1, [10, 7, 9, 5, 2, 8]),
 ]
 
 
@@ -126,3 +134,255 @@ def test_remove(
 
     assert heap.remove(item_to_remove) == expected_removed_item
     assert heap._data == expected_state
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 10, 101, 1000])
+def test_extract_all(size: int) -> None:
+    """Test that extracting all the items returns them in descending order."""
+    data = [random.randint(0, size) for _ in range(size)]  # noqa: S311
+    heap = MaxHeap[int](data)
+
+    extracted_items = [heap.extract() for _ in range(size)]
+
+    assert extracted_items == sorted(data, reverse=True)
+    assert heap.extract() is None
+
+
+max_heap_extract_many_test_data = [
+    ([], 2, [], []),
+    ([3, 9, 2, 1, 4, 5], 0, [], [9, 5, 4, 3, 2, 1]),
+    ([3, 9, 2, 1, 4, 5], 2, [9, 5], [4, 3, 2, 1]),
+    ([3, 9, 2, 1, 4, 5], 10, [9, 5, 4, 3, 2, 1], []),
+]
+
+
+@pytest.mark.parametrize(
+    "data,k,expected_extracted_items,expected_remaining_items",
+    max_heap_extract_many_test_data,
+)
+def test_extract_many(
+    data: List[int],
+    k: int,
+    expected_extracted_items: List[int],
+    expected_remaining_items: List[int],
+) -> None:
+    """Test removal of the k biggest items."""
+    heap = MaxHeap[int](data)
+
+    assert heap.extract_many(k) == expected_extracted_items
+    assert heap.extract_many(heap.size()) == expected_remaining_items
+
+
+max_heap_insert_many_test_data = [
+    ([], []),
+    ([], [3, 9, 2, 1, 4, 5]),
+    ([3, 9, 2, 1, 4, 5], [7]),
+    ([3, 9, 2, 1, 4, 5], [7, 0, 10, 5, 5, 6, 1]),
+    (list(range(1000)), [500, -1, 2000]),
+]
+
+
+@pytest.mark.parametrize("data,new_items", max_heap_insert_many_test_data)
+def test_insert_many(data: List[int], new_items: List[int]) -> None:
+    """Test insertion of many items at once."""
+    heap = MaxHeap[int](data)
+
+    heap.insert_many(iter(new_items))
+
+    assert heap.size() == len(data) + len(new_items)
+    assert heap.extract_many(heap.size()) == sorted(data + new_items, reverse=True)
+
+
+def _drain(heap: IndexedHeap[str, int]) -> List[tuple[str, int]]:
+    items: List[tuple[str, int]] = []
+    item = heap.extract()
+    while item is not None:
+        items.append(item)
+        item = heap.extract()
+    return items
+
+
+indexed_max_heap_test_data = [
+    ([], []),
+    ([("a", 1)], [("a", 1)]),
+    ([("a", 1), ("b", 3), ("c", 2)], [("b", 3), ("c", 2), ("a", 1)]),
+    # Duplicate keys, last priority wins
+    ([("a", 1), ("b", 3), ("a", 5)], [("a", 5), ("b", 3)]),
+]
+
+
+@pytest.mark.parametrize("items,expected_items", indexed_max_heap_test_data)
+def test_indexed_max_heap_build(
+    items: List[tuple[str, int]], expected_items: List[tuple[str, int]]
+) -> None:
+    """Test construction and draining of an indexed heap."""
+    heap = IndexedMaxHeap[str, int](items)
+
+    assert heap.size() == len(expected_items)
+    assert heap.max() == (expected_items[0] if expected_items else None)
+    assert _drain(heap) == expected_items
+
+
+def test_indexed_max_heap_insert_and_contains() -> None:
+    """Test insertion of keys, including already present ones."""
+    heap = IndexedMaxHeap[str, int]()
+
+    heap.insert("a", 1)
+    heap.insert("b", 2)
+    heap.insert("a", 3)
+
+    assert heap.contains("a")
+    assert not heap.contains("c")
+    assert heap.get_priority("a") == 3
+    assert heap.get_priority("c") is None
+    assert _drain(heap) == [("a", 3), ("b", 2)]
+
+
+indexed_max_heap_update_test_data = [
+    ("e", 10, True, [("e", 10), ("a", 9), ("b", 8), ("c", 7), ("d", 6)]),
+    ("a", 0, True, [("b", 8), ("c", 7), ("d", 6), ("e", 5), ("a", 0)]),
+    ("c", 7, True, [("a", 9), ("b", 8), ("c", 7), ("d", 6), ("e", 5)]),
+    ("not-present", 1, False, [("a", 9), ("b", 8), ("c", 7), ("d", 6), ("e", 5)]),
+]
+
+
+@pytest.mark.parametrize(
+    "key,priority,expected_updated,expected_items", indexed_max_heap_update_test_data
+)
+def test_indexed_max_heap_update(
+    key: str,
+    priority: int,
+    expected_updated: bool,
+    expected_items: List[tuple[str, int]],
+) -> None:
+    """Test that priorities can be increased and decreased."""
+    heap = IndexedMaxHeap[str, int]([("a", 9), ("b", 8), ("c", 7), ("d", 6), ("e", 5)])
+
+    assert heap.update(key, priority) == expected_updated
+    assert _drain(heap) == expected_items
+
+
+indexed_max_heap_remove_test_data = [
+    ("a", 9, [("b", 8), ("c", 7), ("d", 6), ("e", 5)]),
+    ("d", 6, [("a", 9), ("b", 8), ("c", 7), ("e", 5)]),
+    ("e", 5, [("a", 9), ("b", 8), ("c", 7), ("d", 6)]),
+    ("not-present", None, [("a", 9), ("b", 8), ("c", 7), ("d", 6), ("e", 5)]),
+]
+
+
+@pytest.mark.parametrize(
+    "key,expected_priority,expected_items", indexed_max_heap_remove_test_data
+)
+def test_indexed_max_heap_remove(
+    key: str, expected_priority: int, expected_items: List[tuple[str, int]]
+) -> None:
+    """Test removal of arbitrary keys."""
+    heap = IndexedMaxHeap[str, int]([("a", 9), ("b", 8), ("c", 7), ("d", 6), ("e", 5)])
+
+    assert heap.remove(key) == expected_priority
+    assert not heap.contains(key)
+    assert _drain(heap) == expected_items
+
+
+def test_indexed_max_heap_random_operations() -> None:
+    """Test a random sequence of operations against a plain dict."""
+    heap = IndexedMaxHeap[str, int]()
+    expected: dict[str, int] = {}
+
+    for _ in range(2000):
+        key = str(random.randint(0, 50))  # noqa: S311
+        priority = random.randint(0, 100)  # noqa: S311
+        operation = random.random()  # noqa: S311
+
+        if operation < 0.4:
+            heap.insert(key, priority)
+            expected[key] = priority
+        elif operation < 0.7:
+            assert heap.update(key, priority) == (key in expected)
+            if key in expected:
+                expected[key] = priority
+        else:
+            assert heap.remove(key) == expected.pop(key, None)
+
+        assert heap.size() == len(expected)
+
+    drained_priorities = [priority for _, priority in _drain(heap)]
+
+    assert drained_priorities == sorted(expected.values(), reverse=True)
+
+
+falsy_items_test_data = [
+    ([0, 2, 1], 0, [2, 1]),
+    ([0, -1, -2], 0, [-1, -2]),
+    ([False, True], False, [True]),
+]
+
+
+@pytest.mark.parametrize("data,item_to_remove,expected_items", falsy_items_test_data)
+def test_max_heap_falsy_items(
+    data: List[int], item_to_remove: int, expected_items: List[int]
+) -> None:
+    """Test that falsy items are handled like any other item."""
+    heap = MaxHeap[int](data)
+
+    assert heap.max() == max(data)
+    assert heap.remove(item_to_remove) == item_to_remove
+    assert heap.remove(item_to_remove) is None
+    assert heap.extract_many(heap.size()) == expected_items
+
+
+def test_max_heap_falsy_string_items() -> None:
+    """Test that empty strings can be added and removed."""
+    heap = MaxHeap[str](["b", "", "a"])
+
+    assert heap.remove("") == ""
+    assert heap.extract_many(heap.size()) == ["b", "a"]
+
+
+def test_min_heap() -> None:
+    """Test that Min heaps extract items in ascending order."""
+    data = [3, 9, 2, 1, 4, 5, 0]
+    heap = MinHeap[int](data)
+
+    assert heap.min() == 0
+
+    heap.insert(-1)
+    heap.insert_many([7, 8])
+
+    assert heap.extract() == -1
+    assert heap.extract_many(heap.size()) == sorted(data + [7, 8])
+
+
+key_function_test_data = [
+    (False, ["a", "bb", "ccc", "dddd"]),
+    (True, ["dddd", "ccc", "bb", "a"]),
+]
+
+
+@pytest.mark.parametrize("reverse,expected_items", key_function_test_data)
+def test_heap_key_function(reverse: bool, expected_items: List[str]) -> None:
+    """Test that items are ordered by their key."""
+    calls: List[str] = []
+
+    def length(item: str) -> int:
+        calls.append(item)
+        return len(item)
+
+    heap = Heap[str](["ccc", "a", "dddd"], key=length, reverse=reverse)
+    heap.insert("bb")
+
+    assert heap.extract_many(heap.size()) == expected_items
+    # Keys are computed once per item
+    assert sorted(calls) == sorted(expected_items)
+
+
+def test_indexed_min_heap() -> None:
+    """Test that Min indexed heaps extract pairs by ascending priority."""
+    heap = IndexedMinHeap[str, int]([("a", 9), ("b", 8), ("c", 7), ("d", 0)])
+
+    assert heap.min() == ("d", 0)
+
+    heap.update("a", -1)
+    heap.insert("e", 5)
+
+    assert _drain(heap) == [("a", -1), ("d", 0), ("e", 5), ("c", 7), ("b", 8)]
@@ -0,0 +1,363 @@
+"""Unit tests for tree_maps module."""
+
+import random
+from typing import List
+from typing import Optional
+
+import pytest
+
+from my_python_kata.datastructures.binary_trees import Node
+from my_python_kata.datastructures.binary_trees import iter_in_order
+from my_python_kata.datastructures.binary_trees import visit_in_order
+from my_python_kata.datastructures.tree_maps import AvlNode
+from my_python_kata.datastructures.tree_maps import OrderStatisticNode
+from my_python_kata.datastructures.tree_maps import OrderStatisticTreeMap
+from my_python_kata.datastructures.tree_maps import PersistentTreeMap
+from my_python_kata.datastructures.tree_maps import TreeMap
+
+
+def _check_avl(node: Optional[Node[int, str]]) -> int:
+    # Returns the height of the subtree, checking the AVL property and the
+    # stored heights
+    if node is None:
+        return 0
+
+    assert isinstance(node, AvlNode)
+    left_height = _check_avl(node.left_child)
+    right_height = _check_avl(node.right_child)
+
+    assert abs(left_height - right_height) <= 1
+    assert node.height == 1 + max(left_height, right_height)
+
+    return node.height
+
+
+def test_empty_tree_map() -> None:
+    """Test an empty map."""
+    tree_map = TreeMap[int, str]()
+
+    assert tree_map.size() == 0
+    assert tree_map.root is None
+    assert tree_map.get(1) is None
+    assert not tree_map.contains(1)
+    assert tree_map.delete(1) is None
+    assert tree_map.floor(1) is None
+    assert tree_map.ceiling(1) is None
+    assert list(tree_map.items()) == []
+
+
+def test_put_and_get() -> None:
+    """Test that values can be added, updated and read back."""
+    tree_map = TreeMap([(2, "two"), (1, "one"), (3, "three"), (1, "uno")])
+
+    assert tree_map.size() == 3
+    assert tree_map.get(1) == "uno"
+    assert tree_map.get(2) == "two"
+    assert tree_map.contains(3)
+    assert not tree_map.contains(4)
+
+    tree_map.put(4, "four")
+
+    assert tree_map.get(4) == "four"
+    assert list(tree_map.items()) == [(1, "uno"), (2, "two"), (3, "three"), (4, "four")]
+
+
+def test_delete() -> None:
+    """Test removing leaves, nodes with one child and nodes with two children."""
+    tree_map = TreeMap((key, str(key)) for key in range(10))
+
+    assert tree_map.delete(3) == "3"
+    assert tree_map.delete(9) == "9"
+    assert tree_map.delete(8) == "8"
+    assert tree_map.delete(3) is None
+
+    assert tree_map.size() == 7
+    assert list(tree_map.keys()) == [0, 1, 2, 4, 5, 6, 7]
+    _check_avl(tree_map.root)
+
+
+@pytest.mark.parametrize("n_keys", [1, 10, 1000, 5000])
+def test_sorted_insertion_is_balanced(n_keys: int) -> None:
+    """Test that sorted keys do not degrade the tree into a list."""
+    tree_map = TreeMap((key, str(key)) for key in range(n_keys))
+
+    height = _check_avl(tree_map.root)
+
+    # An AVL tree is at most about 1.44 lg2 n high
+    assert height <= 1.45 * n_keys.bit_length()
+    assert list(tree_map.keys()) == list(range(n_keys))
+
+
+floor_ceiling_test_data = [
+    (-5, None, 0),
+    (0, 0, 0),
+    (7, 6, 9),
+    (9, 9, 9),
+    (26, 24, 27),
+    (27, 27, 27),
+    (30, 27, None),
+]
+
+
+@pytest.mark.parametrize("key,expected_floor,expected_ceiling", floor_ceiling_test_data)
+def test_floor_and_ceiling(
+    key: int, expected_floor: Optional[int], expected_ceiling: Optional[int]
+) -> None:
+    """Test floor() and ceiling() on existing and missing keys."""
+    tree_map = TreeMap((key, str(key)) for key in range(0, 30, 3))
+
+    assert tree_map.floor(key) == expected_floor
+    assert tree_map.ceiling(key) == expected_ceiling
+
+
+def test_string_keys() -> None:
+    """Test that string keys are kept in lexicographical order."""
+    tree_map = TreeMap([("pear", 1), ("apple", 2), ("fig", 3)])
+
+    assert list(tree_map.keys()) == ["apple", "fig", "pear"]
+    assert tree_map.floor("banana") == "apple"
+    assert tree_map.ceiling("banana") == "fig"
+
+
+def test_visit_root() -> None:
+    """Test that the binary_trees traversals work on the map nodes."""
+    tree_map = TreeMap((key, str(key)) for key in range(20, 0, -1))
+    collected_keys: List[int] = []
+
+    def collect(node: Node[int, str]) -> bool:
+        collected_keys.append(node.key)
+        return True
+
+    visit_in_order(tree_map.root, collect)
+
+    assert collected_keys == list(range(1, 21))
+
+
+def test_random_operations() -> None:
+    """Test a random mix of operations against a dict."""
+    tree_map = TreeMap[int, str]()
+    expected: dict[int, str] = {}
+
+    for _ in range(2000):
+        key = random.randint(0, 200)  # noqa: S311
+        if random.random() < 0.6:  # noqa: S311
+            tree_map.put(key, str(key))
+            expected[key] = str(key)
+        else:
+            assert tree_map.delete(key) == expected.pop(key, None)
+
+    _check_avl(tree_map.root)
+    assert tree_map.size() == len(expected)
+    assert list(tree_map.items()) == sorted(expected.items())
+
+
+iter_range_test_data = [
+    (0, 30, list(range(0, 30, 3))),
+    (4, 13, [6, 9, 12]),
+    (3, 12, [3, 6, 9, 12]),
+    (-10, 0, [0]),
+    (28, 100, []),
+    (13, 4, []),
+]
+
+
+@pytest.mark.parametrize("low,high,expected_keys", iter_range_test_data)
+def test_iter_range(low: int, high: int, expected_keys: List[int]) -> None:
+    """Test iterating on a range of keys, with bounds in and out of the map."""
+    tree_map = TreeMap((key, str(key)) for key in range(0, 30, 3))
+
+    assert list(tree_map.iter_range(low, high)) == [
+        (key, str(key)) for key in expected_keys
+    ]
+
+
+def _check_sizes(node: Optional[Node[int, str]]) -> int:
+    if node is None:
+        return 0
+
+    assert isinstance(node, OrderStatisticNode)
+    size = 1 + _check_sizes(node.left_child) + _check_sizes(node.right_child)
+    assert node.size == size
+
+    return size
+
+
+rank_test_data = [
+    (-1, 0),
+    (0, 0),
+    (1, 1),
+    (3, 1),
+    (27, 9),
+    (28, 10),
+]
+
+
+@pytest.mark.parametrize("key,expected_rank", rank_test_data)
+def test_rank(key: int, expected_rank: int) -> None:
+    """Test rank() on existing and missing keys."""
+    tree_map = OrderStatisticTreeMap((key, str(key)) for key in range(0, 30, 3))
+
+    assert tree_map.rank(key) == expected_rank
+
+
+def test_select() -> None:
+    """Test select() on every position, including negative ones."""
+    keys = list(range(0, 30, 3))
+    tree_map = OrderStatisticTreeMap((key, str(key)) for key in reversed(keys))
+
+    assert [tree_map.select(i) for i in range(len(keys))] == keys
+    assert tree_map.select(-1) == 27
+
+    with pytest.raises(IndexError):
+        tree_map.select(len(keys))
+
+    with pytest.raises(IndexError):
+        OrderStatisticTreeMap[int, str]().select(0)
+
+
+count_range_test_data = [
+    (0, 27, 10),
+    (1, 26, 8),
+    (3, 3, 1),
+    (4, 5, 0),
+    (-10, 100, 10),
+    (10, 5, 0),
+]
+
+
+@pytest.mark.parametrize("low,high,expected_count", count_range_test_data)
+def test_count_range(low: int, high: int, expected_count: int) -> None:
+    """Test count_range() with bounds in and out of the map."""
+    tree_map = OrderStatisticTreeMap((key, str(key)) for key in range(0, 30, 3))
+
+    assert tree_map.count_range(low, high) == expected_count
+
+
+def test_order_statistics_random_operations() -> None:
+    """Test that subtree sizes are kept up to date by a random mix of operations."""
+    tree_map = OrderStatisticTreeMap[int, str]()
+    expected: dict[int, str] = {}
+
+    for _ in range(2000):
+        key = random.randint(0, 200)  # noqa: S311
+        if random.random() < 0.6:  # noqa: S311
+            tree_map.put(key, str(key))
+            expected[key] = str(key)
+        else:
+            tree_map.delete(key)
+            expected.pop(key, None)
+
+    _check_avl(tree_map.root)
+    _check_sizes(tree_map.root)
+
+    keys = sorted(expected)
+    assert [tree_map.select(i) for i in range(len(keys))] == keys
+    assert tree_map.count_range(50, 150) == len([k for k in keys if 50 <= k <= 150])
+
+
+@pytest.mark.parametrize("n_keys", [0, 1, 2, 10, 1000])
+def test_from_sorted(n_keys: int) -> None:
+    """Test building a map from sorted pairs, then changing it."""
+    tree_map = TreeMap.from_sorted([(key, str(key)) for key in range(n_keys)])
+
+    assert tree_map.size() == n_keys
+    assert list(tree_map.keys()) == list(range(n_keys))
+    _check_avl(tree_map.root)
+
+    tree_map.put(n_keys, "new")
+    tree_map.delete(0)
+
+    assert list(tree_map.keys()) == list(range(1, n_keys + 1))
+    _check_avl(tree_map.root)
+
+
+def test_from_sorted_order_statistics() -> None:
+    """Test that subtree sizes are computed when building from sorted pairs."""
+    tree_map = OrderStatisticTreeMap.from_sorted([(key, str(key)) for key in range(50)])
+
+    assert isinstance(tree_map, OrderStatisticTreeMap)
+    _check_sizes(tree_map.root)
+    assert tree_map.select(17) == 17
+    assert tree_map.count_range(10, 19) == 10
+
+
+@pytest.mark.parametrize("keys", [[2, 1], [1, 1], [1, 3, 2]])
+def test_from_sorted_unsorted_keys(keys: List[int]) -> None:
+    """Test that unsorted or duplicate keys are refused."""
+    with pytest.raises(ValueError):
+        TreeMap.from_sorted([(key, str(key)) for key in keys])
+
+
+def test_persistent_put_and_delete() -> None:
+    """Test that updates return new maps and leave the original unchanged."""
+    empty = PersistentTreeMap[int, str]()
+    first = empty.put(1, "one").put(2, "two")
+    second = first.put(1, "uno").put(3, "three")
+    third = second.delete(2)
+
+    assert list(empty.items()) == []
+    assert list(first.items()) == [(1, "one"), (2, "two")]
+    assert list(second.items()) == [(1, "uno"), (2, "two"), (3, "three")]
+    assert list(third.items()) == [(1, "uno"), (3, "three")]
+    assert third.size() == 2
+
+    # Nothing to delete, so the map is unchanged
+    assert third.delete(2) is third
+
+
+def test_persistent_shares_nodes() -> None:
+    """Test that only the nodes along the changed path are copied."""
+    tree_map = PersistentTreeMap((key, str(key)) for key in range(1000))
+    height = _check_avl(tree_map.root)
+
+    for updated_map in (
+        tree_map.put(500, "new"),
+        tree_map.put(1000, "new"),
+        tree_map.delete(0),
+        tree_map.delete(500),
+    ):
+        _check_avl(updated_map.root)
+
+        old_nodes = {id(node) for node in iter_in_order(tree_map.root)}
+        new_nodes = [
+            node
+            for node in iter_in_order(updated_map.root)
+            if id(node) not in old_nodes
+        ]
+        # Rotations may copy a few more nodes than the path
+        assert len(new_nodes) <= height + 4
+
+
+def test_persistent_snapshots() -> None:
+    """Test a random mix of operations, keeping every version."""
+    versions = [(PersistentTreeMap[int, str](), dict[int, str]())]
+
+    for _ in range(500):
+        tree_map, expected = versions[-1]
+        expected = dict(expected)
+
+        key = random.randint(0, 100)  # noqa: S311
+        if random.random() < 0.6:  # noqa: S311
+            tree_map = tree_map.put(key, str(len(versions)))
+            expected[key] = str(len(versions))
+        else:
+            tree_map = tree_map.delete(key)
+            expected.pop(key, None)
+
+        versions.append((tree_map, expected))
+
+    for tree_map, expected in versions:
+        _check_avl(tree_map.root)
+        assert tree_map.size() == len(expected)
+        assert list(tree_map.items()) == sorted(expected.items())
+
+
+def test_persistent_from_sorted() -> None:
+    """Test building a persistent map from sorted pairs."""
+    tree_map = PersistentTreeMap.from_sorted([(key, str(key)) for key in range(10)])
+    updated_map = tree_map.delete(5)
+
+    assert isinstance(updated_map, PersistentTreeMap)
+    assert tree_map.contains(5)
+    assert not updated_map.contains(5)
+    assert updated_map.floor(5) == 4